@@ -1,8 +1,10 @@
 #backend/database.py
 from dotenv import load_dotenv
+import asyncio
 import os
+from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
+from pymongo.errors import PyMongoError
 
 load_dotenv()
 
@@ -10,15 +12,40 @@ mongo_uri = os.getenv("MONGO_URL")
 if not mongo_uri:
     raise ValueError("MONGO_URI environment variable is not set")
 
-try:
-    client = MongoClient(mongo_uri)
-    # Test the connection
-    client.admin.command('ping')
-    db = client["cv-align"]
-    print("Successfully connected to MongoDB")
-except ConnectionFailure:
-    print("Failed to connect to MongoDB")
-    raise
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "cv-align")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "10000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "30000"))
+# Backoff between index-creation attempts when MongoDB is down at startup
+MONGO_INDEX_RETRY_S = float(os.getenv("MONGO_INDEX_RETRY_S", "5"))
+MONGO_INDEX_RETRY_MAX_S = float(os.getenv("MONGO_INDEX_RETRY_MAX_S", "300"))
+
+
+def client_options() -> dict:
+    # connect=False: nothing touches the network until the first operation
+    return {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS,
+        "connect": False,
+    }
+
+
+# Async (Motor) client used by the request handlers; never blocks the event loop.
+# Motor binds to the running loop on first use, so creating it at import is safe.
+client = AsyncIOMotorClient(mongo_uri, **client_options())
+db = client[MONGO_DB_NAME]
+
+# Synchronous client for code that already runs off the event loop
+# (worker threads: JD parsing, scoring, the embedding cache)
+sync_client = MongoClient(mongo_uri, **client_options())
+sync_db = sync_client[MONGO_DB_NAME]
 
 # Collections
 students_collection = db["students"]
@@ -26,8 +53,58 @@ recruiters_collection = db["recruiters"]
 jobs_collection = db["jobs"]
 applications_collection = db["applications"]
 parsed_cv_collection = db["parsed_cv"]
-parsed_jd_collection = db["parsed_jd"] 
+parsed_jd_collection = db["parsed_jd"]
+evaluation_jobs_collection = db["evaluation_jobs"]
+evaluation_tasks_collection = db["evaluation_tasks"]
+llm_cache_collection = db["llm_cache"]
+embedding_cache_collection = sync_db["embedding_cache"]
+
+
+async def create_indexes():
+    await parsed_cv_collection.create_index([("student_email", 1), ("cv_id", 1)], unique=True)
+    await parsed_jd_collection.create_index("job_id", unique=True)
+    await evaluation_jobs_collection.create_index([("status", 1), ("created_at", 1)])
+    await evaluation_tasks_collection.create_index([("job_id", 1), ("application_id", 1)], unique=True)
+    await evaluation_tasks_collection.create_index([("job_id", 1), ("status", 1), ("app_job_id", 1)])
+    # Entries past expires_at are removed by Mongo; entries without it never expire
+    await llm_cache_collection.create_index("expires_at", expireAfterSeconds=0)
+    await llm_cache_collection.create_index([("model", 1), ("template_hash", 1)])
+
+
+_index_task = None
+
+
+async def _create_indexes_when_reachable():
+    delay = MONGO_INDEX_RETRY_S
+    while True:
+        await asyncio.sleep(delay)
+        try:
+            await create_indexes()
+            print("MongoDB reachable again; indexes created")
+            return
+        except PyMongoError as e:
+            print(f"Creating MongoDB indexes failed, retrying in {delay:.0f}s: {e}")
+            delay = min(delay * 2, MONGO_INDEX_RETRY_MAX_S)
+
+
+async def init_db():
+    """Startup hook: check connectivity and create indexes (replaces the import-time ping).
+
+    If MongoDB is not reachable yet, the indexes are created in the background once it is.
+    """
+    global _index_task
+    try:
+        await client.admin.command("ping")
+        print("Successfully connected to MongoDB")
+        await create_indexes()
+    except PyMongoError as e:
+        # Handlers retry on their own; a slow database should not keep the app from starting
+        print(f"MongoDB not reachable at startup, creating indexes in the background: {e}")
+        _index_task = asyncio.create_task(_create_indexes_when_reachable())
 
-parsed_cv_collection.create_index([("student_email", 1), ("cv_id", 1)], unique=True)
-parsed_jd_collection.create_index("job_id", unique=True)
 
+def close_db():
+    if _index_task is not None:
+        _index_task.cancel()
+    client.close()
+    sync_client.close()
@@ -5,6 +5,13 @@ from routes.students import router as students_router
 from routes.recruiters import router as recruiters_router
 from routes.jobs import router as jobs_router
 from routes.applications import router as applications_router
+from routes.evaluations import router as evaluations_router, start_inprocess_worker, stop_inprocess_worker
+from utils.model_registry import model_stats
+from utils.embedding_cache import embedding_cache
+from database import init_db, close_db
+from utils.executors import executor_stats, shutdown_executors
+from utils.llm_limiter import llm_limiter
+from utils.llm_cache import llm_cache
 import uvicorn
 
 app = FastAPI(
@@ -22,11 +29,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def startup():
+    await init_db()
+    start_inprocess_worker()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await stop_inprocess_worker()
+    shutdown_executors()
+    close_db()
+
 # Include routers
 app.include_router(students_router, prefix="/api/students", tags=["Students"])
 app.include_router(recruiters_router, prefix="/api/recruiters", tags=["Recruiters"])
 app.include_router(jobs_router, prefix="/api/jobs", tags=["Jobs"])
 app.include_router(applications_router, prefix="/api/applications", tags=["Applications"])
+app.include_router(evaluations_router, prefix="/api/evaluations", tags=["Evaluations"])
 
 @app.get("/")
 async def root():
@@ -36,5 +55,15 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/models")
+async def model_health():
+    """Load state, load time and memory footprint of each shared ML model, plus embedding cache counters"""
+    return {"models": model_stats(), "embedding_cache": embedding_cache.stats()}
+
+@app.get("/health/executors")
+async def executor_health():
+    """Queue depth, wait time and run time of the inference thread pool and the parse process pool, plus LLM call counters"""
+    return {**executor_stats(), "llm": llm_limiter.stats, "llm_cache": llm_cache.stats()}
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
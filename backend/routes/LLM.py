@@ -1,33 +1,20 @@
-from pinecone import Pinecone, ServerlessSpec
-from sentence_transformers import SentenceTransformer
+from utils.model_registry import get_sbert
+from utils.embedding_cache import cached_encode
+from utils.vector_store import get_vector_store
 from dotenv import load_dotenv
+import hashlib
 import os
+import threading
 
 load_dotenv()
-pine = os.getenv("LLM")
-
-# Initialize Pinecone client
-pc = Pinecone(api_key=pine)
-
-# Create index if not exists
-index_name = "cv-index"
-
-if index_name not in pc.list_indexes().names():
-    pc.create_index(
-        name=index_name,
-        dimension=384,  # all-MiniLM-L6-v2
-        metric="cosine",
-        spec=ServerlessSpec(
-            cloud="gcp",           # or "aws"
-            region="us-central1"   # match Pinecone dashboard region
-        )
-    )
 
-# Connect to the index
-index = pc.Index(index_name)
+# Max chunks per vector-store write
+CHUNK_UPSERT_BATCH_SIZE = int(os.getenv("CHUNK_UPSERT_BATCH_SIZE", "100"))
 
-import uuid
-embedder = SentenceTransformer("all-MiniLM-L6-v2")
+# resume_id -> version last indexed by this process; the stored chunk ids are the durable record
+_indexed_versions = {}
+_resume_locks = {}
+_resume_locks_guard = threading.Lock()
 
 def chunk_resume(parsed_resume):
     chunks = []
@@ -56,18 +43,68 @@ def chunk_resume(parsed_resume):
     return chunks
 
 
-def embed_and_upsert_chunks(resume_id: str, chunks: list):
-    # First delete all old vectors for this resume_id
-    index.delete(filter={"resume_id": resume_id})
-
-    # Then upsert fresh ones
-    vectors = embedder.encode(chunks).tolist()
-    ids = [f"{resume_id}-{i}" for i in range(len(chunks))]
-    pinecone_vectors = list(zip(ids, vectors, [{"text": c, "resume_id": resume_id} for c in chunks]))
-    index.upsert(pinecone_vectors)
-
-def query_pinecone(jd_text: str, top_k: int = 5):
-    jd_embedding = embedder.encode([jd_text])[0].tolist()
-    result = index.query(vector=jd_embedding, top_k=top_k, include_metadata=True)
-    return [match["metadata"]["text"] for match in result["matches"]]
-
+def chunk_id(resume_id: str, chunk: str) -> str:
+    # Content-addressed: an unchanged chunk keeps its id across re-indexing
+    return f"{resume_id}-{hashlib.sha256(chunk.encode('utf-8')).hexdigest()[:16]}"
+
+def resume_version(chunks: list) -> str:
+    return hashlib.sha256("\x1f".join(chunks).encode("utf-8")).hexdigest()
+
+def _resume_lock(resume_id: str) -> threading.Lock:
+    with _resume_locks_guard:
+        return _resume_locks.setdefault(resume_id, threading.Lock())
+
+def _batches(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def embed_and_upsert_chunks(resume_id: str, chunks: list) -> dict:
+    """Index a resume's chunks once per resume version, touching only chunks that changed.
+
+    Stored chunk ids are compared with the new content hashes: new chunks are embedded and
+    upserted in batches of CHUNK_UPSERT_BATCH_SIZE, vanished ones are deleted, the rest is
+    left alone. Concurrent calls for the same resume index it once.
+    """
+    version = resume_version(chunks)
+    with _resume_lock(resume_id):
+        if _indexed_versions.get(resume_id) == version:
+            return {"resume_id": resume_id, "upserted": 0, "deleted": 0, "unchanged": True}
+
+        store = get_vector_store()
+        wanted = {}
+        for chunk in chunks:
+            wanted.setdefault(chunk_id(resume_id, chunk), chunk)
+        existing = set(store.list_ids(prefix=f"{resume_id}-"))
+
+        stale = [id_ for id_ in existing if id_ not in wanted]
+        for batch in _batches(stale, CHUNK_UPSERT_BATCH_SIZE):
+            store.delete(ids=batch)
+
+        new_ids = [id_ for id_ in wanted if id_ not in existing]
+        for batch in _batches(new_ids, CHUNK_UPSERT_BATCH_SIZE):
+            texts = [wanted[id_] for id_ in batch]
+            vectors = cached_encode(texts, get_sbert())
+            store.upsert([
+                (id_, vector, {"text": text, "resume_id": resume_id, "chunk_hash": id_.rsplit("-", 1)[1]})
+                for id_, vector, text in zip(batch, vectors, texts)
+            ])
+
+        _indexed_versions[resume_id] = version
+        return {"resume_id": resume_id, "upserted": len(new_ids), "deleted": len(stale), "unchanged": False}
+
+def embed_queries(texts: list):
+    """SBERT embeddings of JD query texts, one batched (cached) encode"""
+    return cached_encode(texts, get_sbert())
+
+def query_resume_chunks(resume_id: str, jd_embedding, top_k: int = 5):
+    """Top chunks of one resume for a precomputed JD query embedding"""
+    matches = get_vector_store().query(jd_embedding, top_k=top_k, filter={"resume_id": resume_id})
+    return [match["metadata"]["text"] for match in matches]
+
+def query_pinecone(jd_text: str, top_k: int = 5, resume_id: str = None):
+    """Top resume chunks for a JD query, scoped to one resume when resume_id is given"""
+    jd_embedding = embed_queries([jd_text])[0]
+    matches = get_vector_store().query(
+        jd_embedding, top_k=top_k, filter={"resume_id": resume_id} if resume_id else None
+    )
+    return [match["metadata"]["text"] for match in matches]
@@ -21,7 +21,7 @@ async def apply_for_job(
         decoded_email = unquote(student_email)
         
         # Verify student exists and get their CV
-        student = students_collection.find_one({"email": decoded_email})
+        student = await students_collection.find_one({"email": decoded_email})
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
         
@@ -36,12 +36,12 @@ async def apply_for_job(
             raise HTTPException(status_code=404, detail="CV not found")
         
         # Verify job exists and is active
-        job = jobs_collection.find_one({"_id": ObjectId(job_id), "is_active": True})
+        job = await jobs_collection.find_one({"_id": ObjectId(job_id), "is_active": True})
         if not job:
             raise HTTPException(status_code=404, detail="Job not found or inactive")
         
         # Check if student has already applied for this job
-        existing_application = applications_collection.find_one({
+        existing_application = await applications_collection.find_one({
             "student_email": decoded_email,
             "job_id": job_id
         })
@@ -65,7 +65,7 @@ async def apply_for_job(
             "recruiter_email": job.get("recruiter_email", "")
         }
         
-        result = applications_collection.insert_one(application_data)
+        result = await applications_collection.insert_one(application_data)
         
         return {
             "message": "Application submitted successfully",
@@ -83,7 +83,7 @@ async def get_student_applications(student_email: str):
     # Decode URL-encoded email
     decoded_email = unquote(student_email)
     
-    applications = list(applications_collection.find({"student_email": decoded_email}).sort("applied_at", -1))
+    applications = await applications_collection.find({"student_email": decoded_email}).sort("applied_at", -1).to_list(None)
     
     for app in applications:
         app["_id"] = str(app["_id"])
@@ -99,11 +99,11 @@ async def get_job_applications(job_id: str, recruiter_email: str):
         decoded_email = unquote(recruiter_email)
         
         # Verify the job belongs to the recruiter
-        job = jobs_collection.find_one({"_id": ObjectId(job_id), "recruiter_email": decoded_email})
+        job = await jobs_collection.find_one({"_id": ObjectId(job_id), "recruiter_email": decoded_email})
         if not job:
             raise HTTPException(status_code=404, detail="Job not found or unauthorized")
         
-        applications = list(applications_collection.find({"job_id": job_id}).sort("applied_at", -1))
+        applications = await applications_collection.find({"job_id": job_id}).sort("applied_at", -1).to_list(None)
         
         for app in applications:
             app["_id"] = str(app["_id"])
@@ -127,14 +127,14 @@ async def get_recruiter_applications(recruiter_email: str):
     decoded_email = unquote(recruiter_email)
     
     # Get all jobs by this recruiter
-    recruiter_jobs = list(jobs_collection.find({"recruiter_email": decoded_email}))
+    recruiter_jobs = await jobs_collection.find({"recruiter_email": decoded_email}).to_list(None)
     job_ids = [str(job["_id"]) for job in recruiter_jobs]
     
     if not job_ids:
         return {"applications": [], "total_applications": 0}
     
     # Get all applications for these jobs
-    applications = list(applications_collection.find({"job_id": {"$in": job_ids}}).sort("applied_at", -1))
+    applications = await applications_collection.find({"job_id": {"$in": job_ids}}).sort("applied_at", -1).to_list(None)
     
     for app in applications:
         app["_id"] = str(app["_id"])
@@ -153,7 +153,7 @@ async def get_recruiter_analytics(recruiter_email: str):
         decoded_email = unquote(recruiter_email)
         
         # Get all jobs by this recruiter
-        recruiter_jobs = list(jobs_collection.find({"recruiter_email": decoded_email}))
+        recruiter_jobs = await jobs_collection.find({"recruiter_email": decoded_email}).to_list(None)
         job_ids = [str(job["_id"]) for job in recruiter_jobs]
         
         if not job_ids:
@@ -171,7 +171,7 @@ async def get_recruiter_analytics(recruiter_email: str):
             }
         
         # Get all applications for these jobs
-        applications = list(applications_collection.find({"job_id": {"$in": job_ids}}))
+        applications = await applications_collection.find({"job_id": {"$in": job_ids}}).to_list(None)
         
         # Calculate status breakdown
         status_breakdown = {
@@ -187,9 +187,9 @@ async def get_recruiter_analytics(recruiter_email: str):
                 status_breakdown[status] += 1
         
         # Get recent applications (last 10)
-        recent_applications = list(applications_collection.find(
+        recent_applications = await applications_collection.find(
             {"job_id": {"$in": job_ids}}
-        ).sort("applied_at", -1).limit(10))
+        ).sort("applied_at", -1).limit(10).to_list(None)
         
         for app in recent_applications:
             app["_id"] = str(app["_id"])
@@ -235,12 +235,12 @@ async def update_application_status(
         decoded_email = unquote(recruiter_email)
         
         # Verify application exists and belongs to recruiter's job
-        application = applications_collection.find_one({"_id": ObjectId(application_id)})
+        application = await applications_collection.find_one({"_id": ObjectId(application_id)})
         if not application:
             raise HTTPException(status_code=404, detail="Application not found")
         
         # Verify the recruiter owns the job
-        job = jobs_collection.find_one({
+        job = await jobs_collection.find_one({
             "_id": ObjectId(application["job_id"]),
             "recruiter_email": decoded_email
         })
@@ -268,7 +268,7 @@ async def update_application_status(
         if feedback:
             update_data["feedback"] = feedback
         
-        result = applications_collection.update_one(
+        result = await applications_collection.update_one(
             {"_id": ObjectId(application_id)},
             {"$set": update_data}
         )
@@ -287,7 +287,7 @@ async def update_application_status(
 async def get_application_details(application_id: str):
     """Get detailed information about a specific application"""
     try:
-        application = applications_collection.find_one({"_id": ObjectId(application_id)})
+        application = await applications_collection.find_one({"_id": ObjectId(application_id)})
         if not application:
             raise HTTPException(status_code=404, detail="Application not found")
         
@@ -296,7 +296,7 @@ async def get_application_details(application_id: str):
         application["reviewed_at"] = application["reviewed_at"].isoformat() if application.get("reviewed_at") else None
         
         # Get additional job details
-        job = jobs_collection.find_one({"_id": ObjectId(application["job_id"])})
+        job = await jobs_collection.find_one({"_id": ObjectId(application["job_id"])})
         if job:
             application["job_details"] = {
                 "title": job.get("title", ""),
@@ -304,7 +304,7 @@ async def get_application_details(application_id: str):
             }
         
         # Get student details
-        student = students_collection.find_one({"email": application["student_email"]})
+        student = await students_collection.find_one({"email": application["student_email"]})
         if student:
             application["student_details"] = {
                 "name": student.get("name", ""),
@@ -327,7 +327,7 @@ async def withdraw_application(application_id: str, student_email: str):
         decoded_email = unquote(student_email)
         
         # Verify application exists and belongs to the student
-        application = applications_collection.find_one({
+        application = await applications_collection.find_one({
             "_id": ObjectId(application_id),
             "student_email": decoded_email
         })
@@ -338,7 +338,7 @@ async def withdraw_application(application_id: str, student_email: str):
         if application.get("status") != "pending":
             raise HTTPException(status_code=400, detail="Cannot withdraw application that has been reviewed")
         
-        result = applications_collection.delete_one({"_id": ObjectId(application_id)})
+        result = await applications_collection.delete_one({"_id": ObjectId(application_id)})
         
         if result.deleted_count == 0:
             raise HTTPException(status_code=400, detail="Failed to withdraw application")
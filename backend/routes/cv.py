@@ -12,13 +12,13 @@ async def upload_job(role: str = Form(...),):
     doc = {
         "role": role,
     }
-    result = db.jobs.insert_one(doc)
+    result = await db.jobs.insert_one(doc)
     return {"job_id": str(result.inserted_id)}
 
 @router.post("/upload-cv/")
 async def upload_cv_file(file: UploadFile = File(...), name: str = Form(...), email: str = Form(...), job_id: str = Form(...)):
     cv_url = upload_cv(file)
-    db.cvs.insert_one({
+    await db.cvs.insert_one({
         "name": name,
         "email": email,
         "job_id": job_id,
@@ -33,21 +33,21 @@ async def upload_job_description(file: UploadFile = File(...)):
 
 @router.get("/jobs/")
 async def list_jobs():
-    jobs = list(db.jobs.find())
+    jobs = await db.jobs.find().to_list(None)
     for job in jobs:
         job["_id"] = str(job["_id"])
     return jobs
 
 @router.get("/applications/")
 async def get_applications(job_id: str = Query(...)):
-    applications = list(db.cvs.find({"job_id": job_id}))
+    applications = await db.cvs.find({"job_id": job_id}).to_list(None)
     for app in applications:
         app["_id"] = str(app["_id"])
     return applications
 
 @router.get("/cvs/")
 async def get_cvs(email: str = Query(...)):
-    cvs = list(db.cvs.find({"email": email}))
+    cvs = await db.cvs.find({"email": email}).to_list(None)
     for cv in cvs:
         cv["_id"] = str(cv["_id"])
     return cvs
@@ -0,0 +1,243 @@
+import asyncio
+import datetime
+import hashlib
+import os
+import time
+
+import requests
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from database import students_collection, parsed_cv_collection
+from utils.executors import run_parse, PARSE_PROCESSES
+# Worker processes only import routes.parsed_cv, never the DB layer
+from .parsed_cv import parse_cv_bytes, CV_PARSER_VERSION
+
+CV_DOWNLOAD_CONCURRENCY = int(os.getenv("CV_DOWNLOAD_CONCURRENCY", "8"))
+# Bounds the CVs a bulk run keeps downloaded-but-unparsed (2x this value); the parse pool
+# itself stays at PARSE_PROCESSES
+CV_PARSE_WORKERS = int(os.getenv("CV_PARSE_WORKERS", str(PARSE_PROCESSES)))
+CV_WRITE_BATCH_SIZE = int(os.getenv("CV_WRITE_BATCH_SIZE", "100"))
+CV_DOWNLOAD_TIMEOUT_S = float(os.getenv("CV_DOWNLOAD_TIMEOUT_S", "30"))
+
+# Progress of the latest (or running) /parse-all-cvs/ run, served by /parse-all-cvs/progress.
+# Other bulk runs (e.g. the evaluation planner's) track their progress privately.
+bulk_parse_progress = {"running": False}
+
+
+def download_bytes(url: str) -> bytes:
+    response = requests.get(url, timeout=CV_DOWNLOAD_TIMEOUT_S)
+    if response.status_code != 200:
+        raise Exception(f"Failed to download CV (HTTP {response.status_code})")
+    return response.content
+
+
+def cv_parse_status_update(email: str, cv_id, status: str, error: str = None) -> UpdateOne:
+    """Set the parse status shown on the student's CV entry (pending / parsed / failed)"""
+    fields = {"cvs.$.parse_status": status, "cvs.$.parse_error": error}
+    return UpdateOne({"email": email, "cvs._id": cv_id}, {"$set": fields})
+
+
+def parsed_cv_document(email: str, cv_id, source_url: str, data: bytes, parsed: dict) -> dict:
+    return {
+        "student_email": email,
+        "cv_id": cv_id,
+        "parsed": parsed,
+        "source_url": source_url,
+        "content_hash": hashlib.sha256(data).hexdigest(),
+        "parser_version": CV_PARSER_VERSION,
+        "parsed_at": datetime.datetime.now(datetime.timezone.utc)
+    }
+
+
+async def parse_uploaded_cv(email: str, cv_id, source_url: str, data: bytes):
+    """Background task run on upload: parse the received bytes, no re-download.
+
+    The stored parse state matches the uploaded URL, so later bulk runs skip this CV.
+    """
+    try:
+        parsed = await run_parse(parse_cv_bytes, data)
+        doc = parsed_cv_document(email, cv_id, source_url, data, parsed)
+        await parsed_cv_collection.update_one(
+            {"student_email": email, "cv_id": cv_id}, {"$set": doc}, upsert=True
+        )
+        status_op = cv_parse_status_update(email, cv_id, "parsed")
+    except Exception as e:
+        print(f"Parsing uploaded CV {cv_id} of {email} failed: {e}")
+        status_op = cv_parse_status_update(email, cv_id, "failed", str(e))
+    await students_collection.bulk_write([status_op])
+
+
+def _log_progress(p: dict):
+    elapsed = time.perf_counter() - p["_started"]
+    p["elapsed_s"] = round(elapsed, 1)
+    done = p["written"] + p["skipped"] + p["failed"]
+    print(f"CV bulk parse: {done}/{p['total']} done "
+          f"(downloaded={p['downloaded']}, parsed={p['parsed']}, written={p['written']}, "
+          f"skipped={p['skipped']}, failed={p['failed']}) "
+          f"in {elapsed:.1f}s")
+
+
+async def _load_parse_states(emails=None) -> dict:
+    """(student_email, cv_id) -> stored parse state, for every parsed CV (of `emails`, if given)"""
+    projection = {"student_email": 1, "cv_id": 1, "source_url": 1, "content_hash": 1, "parser_version": 1}
+    query = {} if emails is None else {"student_email": {"$in": list(emails)}}
+    return {
+        (doc["student_email"], str(doc["cv_id"])): doc
+        async for doc in parsed_cv_collection.find(query, projection)
+    }
+
+
+def bulk_parse_running() -> bool:
+    return bulk_parse_progress.get("running", False)
+
+
+async def parse_cvs_bulk(download_concurrency: int = None, parse_workers: int = None, write_batch_size: int = None,
+                         force: bool = False, only=None, track_progress: bool = False) -> list:
+    """Download, parse and store every new or changed uploaded CV.
+
+    `only` restricts the run to a set of (student_email, cv_id) pairs, e.g. the CVs an
+    evaluation needs. `track_progress` publishes the run's progress in bulk_parse_progress;
+    otherwise it is only logged. `parse_workers` does not resize the shared parse pool: it
+    bounds how many CVs the run holds downloaded-but-unparsed (2x parse_workers).
+
+    A CV is skipped without downloading when its URL and parser version match the stored
+    parse state, and skipped after downloading when its content hash does. Downloads run
+    concurrently (bounded), parsing runs on the shared parse process pool and results are upserted into
+    parsed_cv in batches. Results keep the students/CVs order.
+    """
+    download_concurrency = download_concurrency or CV_DOWNLOAD_CONCURRENCY
+    parse_workers = parse_workers or CV_PARSE_WORKERS
+    write_batch_size = write_batch_size or CV_WRITE_BATCH_SIZE
+
+    progress = bulk_parse_progress if track_progress else {}
+    # Reset before the first await so a concurrent /parse-all-cvs/ call already sees this run
+    progress.clear()
+    progress.update({
+        "running": True, "total": 0, "downloaded": 0, "parsed": 0, "written": 0, "skipped": 0, "failed": 0,
+        "download_concurrency": download_concurrency, "parse_workers": parse_workers,
+        "write_batch_size": write_batch_size, "elapsed_s": 0.0, "_started": time.perf_counter()
+    })
+    try:
+        return await _parse_cvs(progress, download_concurrency, parse_workers, write_batch_size, force, only)
+    finally:
+        progress["running"] = False
+        if progress["total"]:
+            _log_progress(progress)
+
+
+async def _parse_cvs(progress: dict, download_concurrency: int, parse_workers: int, write_batch_size: int,
+                     force: bool, only) -> list:
+    # Fetch all students with at least one CV
+    query = {"cv_count": {"$gt": 0}}
+    emails = None
+    if only is not None:
+        emails = {email for email, _ in only}
+        query["email"] = {"$in": list(emails)}
+    students = await students_collection.find(query).to_list(None)
+    items = [
+        (student["email"], cv) for student in students for cv in student.get("cvs", [])
+        if only is None or (student["email"], str(cv["_id"])) in only
+    ]
+    states = {} if force else await _load_parse_states(emails)
+
+    results = [None] * len(items)
+    pending_writes = []
+    progress["total"] = len(items)
+
+    def fail(i, email, cv, error):
+        results[i] = {
+            "student_email": email,
+            "cv_id": str(cv.get("_id", "unknown")),
+            "error": str(error)
+        }
+        progress["failed"] += 1
+
+    async def flush():
+        batch = pending_writes[:]
+        pending_writes.clear()
+        if not batch:
+            return
+        ops = [
+            UpdateOne({"student_email": doc["student_email"], "cv_id": doc["cv_id"]}, {"$set": doc}, upsert=True)
+            for _, doc in batch
+        ]
+        failed_positions = {}
+        try:
+            await parsed_cv_collection.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            failed_positions = {err["index"]: err.get("errmsg", "write failed") for err in e.details.get("writeErrors", [])}
+        except Exception as e:
+            failed_positions = {pos: str(e) for pos in range(len(batch))}
+
+        status_ops = []
+        for pos, (i, doc) in enumerate(batch):
+            if pos in failed_positions:
+                fail(i, doc["student_email"], {"_id": doc["cv_id"]}, failed_positions[pos])
+            elif "parsed" in doc:
+                progress["written"] += 1
+                status_ops.append(cv_parse_status_update(doc["student_email"], doc["cv_id"], "parsed"))
+            else:
+                progress["skipped"] += 1
+        if status_ops:
+            try:
+                await students_collection.bulk_write(status_ops, ordered=False)
+            except Exception as e:
+                print(f"Updating CV parse status failed: {e}")
+        _log_progress(progress)
+
+    download_slots = asyncio.Semaphore(download_concurrency)
+    # Bound downloaded-but-unparsed CVs held in memory
+    parse_slots = asyncio.Semaphore(parse_workers * 2)
+
+    def unchanged(i, email, cv):
+        results[i] = {"student_email": email, "cv_id": str(cv["_id"]), "status": "unchanged"}
+
+    async def process(i, email, cv):
+        try:
+            state = states.get((email, str(cv["_id"])), {})
+            is_current = state.get("parser_version") == CV_PARSER_VERSION
+            async with parse_slots:
+                async with download_slots:
+                    data = await asyncio.to_thread(download_bytes, cv["cv_url"])
+                progress["downloaded"] += 1
+                content_hash = hashlib.sha256(data).hexdigest()
+
+                if is_current and state.get("content_hash") == content_hash:
+                    # Same bytes under a new URL: only the URL needs recording
+                    doc = {"student_email": email, "cv_id": cv["_id"], "source_url": cv["cv_url"]}
+                    result = {"student_email": email, "cv_id": str(cv["_id"]), "status": "unchanged"}
+                else:
+                    parsed = await run_parse(parse_cv_bytes, data)
+                    progress["parsed"] += 1
+                    doc = parsed_cv_document(email, cv["_id"], cv["cv_url"], data, parsed)
+                    result = {"student_email": email, "cv_id": str(cv["_id"]), "parsed": parsed}
+
+            pending_writes.append((i, doc))
+            results[i] = result
+            if len(pending_writes) >= write_batch_size:
+                await flush()
+        except Exception as e:
+            fail(i, email, cv, e)
+
+    # Same URL and parser version: skip without downloading
+    todo = []
+    for i, (email, cv) in enumerate(items):
+        state = states.get((email, str(cv["_id"])), {})
+        if state.get("parser_version") == CV_PARSER_VERSION and state.get("source_url") == cv["cv_url"]:
+            unchanged(i, email, cv)
+            progress["skipped"] += 1
+        else:
+            todo.append(i)
+
+    # A repeat run over an unchanged corpus never touches the parse pool
+    if not todo:
+        return results
+
+    await asyncio.gather(*(process(i, *items[i]) for i in todo))
+    await flush()
+    return results
+
+
+def get_bulk_parse_progress() -> dict:
+    return {k: v for k, v in bulk_parse_progress.items() if not k.startswith("_")}
@@ -0,0 +1,177 @@
+import os
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from database import applications_collection, parsed_cv_collection, parsed_jd_collection
+from utils.executors import run_inference
+from utils.model_registry import get_sbert, get_skill2vec
+from .score import evaluate_cvs_batch
+from .jd_features import load_jd_features
+from .cv_pipeline import parse_cvs_bulk
+from .jd_pipeline import parse_job_descriptions
+
+# LLM cascade gates (per job); 0 disables a gate
+LLM_CASCADE_TOP_K = int(os.getenv("LLM_CASCADE_TOP_K", "25"))
+LLM_CASCADE_MIN_SCORE = float(os.getenv("LLM_CASCADE_MIN_SCORE", "30"))
+
+
+def plan_evaluation(applications: list) -> dict:
+    """Work out which parsed CVs and parsed JDs a batch of applications depends on"""
+    plan = {"applications": [], "skipped": [], "cv_keys": set(), "job_ids": set()}
+    for app in applications:
+        job_id = app.get("job_id")
+        student_email = app.get("student_email")
+        cv_id = str(app.get("cv_id", ""))
+        if not job_id or not student_email or not ObjectId.is_valid(cv_id):
+            plan["skipped"].append(app)
+            continue
+        plan["applications"].append(app)
+        plan["cv_keys"].add((student_email, cv_id))
+        plan["job_ids"].add(str(job_id))
+    return plan
+
+
+async def build_artifacts(plan: dict):
+    """Parse the planned CVs/JDs that are missing or stale; each is built at most once"""
+    if plan["job_ids"]:
+        await run_inference(parse_job_descriptions, plan["job_ids"])
+    if plan["cv_keys"]:
+        await parse_cvs_bulk(only=plan["cv_keys"])
+
+
+async def load_artifacts(plan: dict):
+    """Fetch every planned parsed CV and parsed JD with one query each"""
+    cv_ids = [ObjectId(cv_id) for _, cv_id in plan["cv_keys"]]
+    parsed_cvs = {
+        str(doc["cv_id"]): doc
+        async for doc in parsed_cv_collection.find({"cv_id": {"$in": cv_ids}})
+    }
+    parsed_jds = {
+        doc["job_id"]: doc
+        async for doc in parsed_jd_collection.find({"job_id": {"$in": list(plan["job_ids"])}}, {"_id": 0})
+    }
+    return parsed_cvs, parsed_jds
+
+
+def score_applications(applications: list, parsed_cvs: dict, parsed_jds: dict) -> dict:
+    """Score applications grouped by job, one batched scoring call per job; keyed by application _id"""
+    by_job = {}
+    for app in applications:
+        if str(app["cv_id"]) in parsed_cvs and app["job_id"] in parsed_jds:
+            by_job.setdefault(app["job_id"], []).append(app)
+
+    results = {}
+    for job_id, apps in by_job.items():
+        parsed_jd = parsed_jds[job_id]
+        try:
+            batch = evaluate_cvs_batch(
+                jd_structured=parsed_jd["structured"],
+                jd_sections=parsed_jd["parsed_data"],
+                parsed_resumes=[parsed_cvs[str(app["cv_id"])]["parsed"] for app in apps],
+                skill2vec_model=get_skill2vec(),
+                sbert_model=get_sbert(),
+                jd_features=load_jd_features(parsed_jd)
+            )
+        except Exception as e:
+            batch = [{"error": str(e)}] * len(apps)
+        for app, result in zip(apps, batch):
+            results[app["_id"]] = result
+    return results
+
+
+def summarize_result(result: dict) -> dict:
+    """Component scores in the shape the evaluation endpoints report"""
+    return {
+        "course_score": result.get("course_score", 0.0),
+        "final_score": result.get("final_score", 0.0),
+        "skill_score": (result.get("skill_score") or {}).get("final_score", 0.0),
+        "semantic_score": result.get("semantic_score", 0.0),
+    }
+
+
+def manual_score(result: dict) -> float:
+    """Cheap-scorer score on the 0-100 scale used when combining with the LLM score"""
+    summary = summarize_result(result)
+    return 100 * (
+        summary["course_score"] + summary["skill_score"] + summary["semantic_score"] + summary["final_score"]
+    ) / 4
+
+
+def select_for_llm(applications: list, results: dict, top_k: int = None, min_score: float = None) -> set:
+    """_ids of the applications that go on to the LLM stage.
+
+    Cascade per job: ineligible candidates and failed scorings drop out, then candidates
+    below `min_score` (manual score, 0-100), then everyone outside the job's `top_k`.
+    A value of 0 disables that gate.
+    """
+    top_k = LLM_CASCADE_TOP_K if top_k is None else top_k
+    min_score = LLM_CASCADE_MIN_SCORE if min_score is None else min_score
+
+    by_job = {}
+    for app in applications:
+        result = results.get(app["_id"])
+        if result is None or "error" in result or not result.get("eligible"):
+            continue
+        score = manual_score(result)
+        if min_score and score < min_score:
+            continue
+        by_job.setdefault(app["job_id"], []).append((score, app["_id"]))
+
+    selected = set()
+    for candidates in by_job.values():
+        candidates.sort(key=lambda c: c[0], reverse=True)
+        selected.update(app_id for _, app_id in (candidates[:top_k] if top_k else candidates))
+    return selected
+
+
+def cheap_score_update(result: dict) -> dict:
+    """Final result for an application the cascade kept away from the LLM"""
+    score = round(manual_score(result), 2)
+    if not result.get("eligible"):
+        feedback = result.get("eligibility_reason", "")
+    else:
+        feedback = f"Scored by the automatic matcher only ({score}); not shortlisted for detailed review"
+    return {
+        "score": score,
+        "feedback": feedback,
+        "status": "evaluated",
+        "evaluation_stage": "cheap"
+    }
+
+
+def manual_score_update(result: dict) -> dict:
+    return {
+        "score": result["final_score"],
+        "feedback": result["eligibility_reason"],
+        "status": "evaluated"
+    }
+
+
+async def store_scores(applications: list, results: dict):
+    ops = [
+        UpdateOne({"_id": app["_id"]}, {"$set": manual_score_update(results[app["_id"]])})
+        for app in applications
+        if app["_id"] in results and "error" not in results[app["_id"]]
+    ]
+    if ops:
+        await applications_collection.bulk_write(ops, ordered=False)
+
+
+async def evaluate_application_batch(applications: list, store: bool = True) -> dict:
+    """Plan, build missing artifacts once, then score the whole batch.
+
+    Cost is linear in the number of applications: every CV/JD is parsed at most once
+    and every job's candidates are scored together.
+    """
+    plan = plan_evaluation(applications)
+    await build_artifacts(plan)
+    parsed_cvs, parsed_jds = await load_artifacts(plan)
+    results = await run_inference(score_applications, plan["applications"], parsed_cvs, parsed_jds)
+    if store:
+        await store_scores(plan["applications"], results)
+    return {
+        "applications": plan["applications"],
+        "parsed_cvs": parsed_cvs,
+        "parsed_jds": parsed_jds,
+        "results": results
+    }
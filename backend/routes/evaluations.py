@@ -0,0 +1,394 @@
+#backend/routes/evaluations.py
+import asyncio
+import datetime
+import os
+import socket
+import uuid
+from typing import List, Optional
+
+from bson import ObjectId
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from pymongo import ReturnDocument, UpdateOne
+
+from database import applications_collection, evaluation_jobs_collection, evaluation_tasks_collection
+from utils.llm_cache import llm_cache, template_hash
+from .evaluation_planner import evaluate_application_batch, select_for_llm, cheap_score_update
+from .jobs import (
+    evaluate_llm_feedback, feedback_prompt, batch_feedback_prompt, UNSCORED_APPLICATIONS, LLM_FEEDBACK_BATCH_SIZE
+)
+
+# "inprocess" runs a worker inside the API process; "external" expects `python -m routes.evaluations`
+EVALUATION_WORKER = os.getenv("EVALUATION_WORKER", "inprocess")
+EVALUATION_BATCH_SIZE = int(os.getenv("EVALUATION_BATCH_SIZE", "10"))
+EVALUATION_POLL_INTERVAL_S = float(os.getenv("EVALUATION_POLL_INTERVAL_S", "2"))
+# A running job whose worker has not reported for this long is taken over by another worker
+EVALUATION_STALE_AFTER_S = float(os.getenv("EVALUATION_STALE_AFTER_S", "600"))
+# Applications manually scored per step while a job's LLM shortlist is built
+EVALUATION_STAGE_CHUNK = 500
+
+ACTIVE_TASK_STATES = ["pending", "running"]
+
+router = APIRouter()
+
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def _serialize(doc: dict) -> dict:
+    return {k: str(v) if isinstance(v, ObjectId) else v for k, v in doc.items()}
+
+
+async def submit_evaluation_job(application_ids=None) -> dict:
+    """Record an evaluation job and one pending task per application.
+
+    Without application_ids every unscored application is queued. Applications that
+    already have a pending or running task in another job are left out.
+    """
+    query = dict(UNSCORED_APPLICATIONS)
+    if application_ids is not None:
+        query = {"_id": {"$in": [ObjectId(a) for a in application_ids if ObjectId.is_valid(a)]}}
+    candidates = {
+        app["_id"]: app["job_id"]
+        for app in await applications_collection.find(query, {"_id": 1, "job_id": 1}).to_list(None)
+    }
+    active = set(await evaluation_tasks_collection.distinct(
+        "application_id", {"application_id": {"$in": list(candidates)}, "status": {"$in": ACTIVE_TASK_STATES}}
+    ))
+    app_ids = [app_id for app_id in candidates if app_id not in active]
+
+    now = _now()
+    job = {
+        "kind": "llm_feedback",
+        "status": "queued" if app_ids else "completed",
+        "total": len(app_ids),
+        "cancel_requested": False,
+        "created_at": now,
+        "started_at": None,
+        "finished_at": None if app_ids else now,
+        "heartbeat_at": None,
+        "staged_at": None,
+        "worker_id": None,
+        "error": None
+    }
+    result = await evaluation_jobs_collection.insert_one(job)
+    if app_ids:
+        await evaluation_tasks_collection.insert_many([
+            {"job_id": result.inserted_id, "application_id": app_id, "app_job_id": candidates[app_id],
+             "status": "pending", "stage": None, "attempts": 0, "error": None, "updated_at": now}
+            for app_id in app_ids
+        ], ordered=False)
+    job["_id"] = result.inserted_id
+    return job
+
+
+async def task_counts(job_id: ObjectId) -> dict:
+    counts = {}
+    async for row in evaluation_tasks_collection.aggregate([
+        {"$match": {"job_id": job_id}},
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+    ]):
+        counts[row["_id"]] = row["count"]
+    return counts
+
+
+async def claim_next_job(worker_id: str):
+    """Atomically take the oldest queued job, or a running one whose worker went silent"""
+    stale_before = _now() - datetime.timedelta(seconds=EVALUATION_STALE_AFTER_S)
+    return await evaluation_jobs_collection.find_one_and_update(
+        {"$or": [
+            {"status": "queued"},
+            {"status": "running", "heartbeat_at": {"$lt": stale_before}}
+        ]},
+        {"$set": {"status": "running", "worker_id": worker_id, "heartbeat_at": _now()}},
+        sort=[("created_at", 1)],
+        return_document=ReturnDocument.AFTER
+    )
+
+
+async def _finish_job(job_id, status: str, error: str = None):
+    await evaluation_jobs_collection.update_one(
+        {"_id": job_id},
+        {"$set": {"status": status, "finished_at": _now(), "error": error}}
+    )
+
+
+async def stage_job(job_id, worker_id: str):
+    """Build the LLM shortlist over all of a job's pending tasks, once, before any batch runs.
+
+    Every application gets its manual score; select_for_llm then ranks each recruiter job's
+    candidates together, so LLM_CASCADE_TOP_K applies per recruiter job rather than per
+    batch. Applications left out are finished right here with their cheap score; the rest
+    are marked stage "llm" and go through the batches.
+    """
+    tasks = await evaluation_tasks_collection.find({"job_id": job_id, "status": "pending"}).to_list(None)
+    app_ids = [task["application_id"] for task in tasks]
+    applications = {
+        app["_id"]: app
+        for app in await applications_collection.find({"_id": {"$in": app_ids}}).to_list(None)
+    }
+    to_stage = [app for app in applications.values() if app.get("score") is None]
+
+    results, evaluated = {}, []
+    for start in range(0, len(to_stage), EVALUATION_STAGE_CHUNK):
+        run = await evaluate_application_batch(to_stage[start:start + EVALUATION_STAGE_CHUNK], store=False)
+        results.update(run["results"])
+        evaluated.extend(run["applications"])
+        await evaluation_jobs_collection.update_one(
+            {"_id": job_id, "worker_id": worker_id}, {"$set": {"heartbeat_at": _now()}}
+        )
+    shortlisted = select_for_llm(evaluated, results)
+
+    task_ops, app_ops = [], []
+    for task in tasks:
+        app = applications.get(task["application_id"])
+        result = results.get(task["application_id"])
+        if app is None:
+            update = {"status": "skipped", "error": "Application not found"}
+        elif app.get("score") is not None:
+            update = {"status": "done", "error": None}
+        elif result is None:
+            update = {"status": "skipped", "error": "Parsed CV or JD unavailable"}
+        elif "error" in result:
+            update = {"status": "failed", "error": result["error"]}
+        elif app["_id"] in shortlisted:
+            update = {"stage": "llm"}
+        else:
+            update = {"status": "done", "stage": "cheap", "error": None}
+            app_ops.append(UpdateOne({"_id": app["_id"]}, {"$set": cheap_score_update(result)}))
+        update["updated_at"] = _now()
+        task_ops.append(UpdateOne({"_id": task["_id"]}, {"$set": update}))
+    if app_ops:
+        await applications_collection.bulk_write(app_ops, ordered=False)
+    if task_ops:
+        await evaluation_tasks_collection.bulk_write(task_ops, ordered=False)
+    await evaluation_jobs_collection.update_one({"_id": job_id}, {"$set": {"staged_at": _now()}})
+    print(f"Evaluation job {job_id}: {len(shortlisted)} of {len(tasks)} applications shortlisted for LLM feedback")
+
+
+async def _next_task_batch(job_id) -> list:
+    """Pending tasks of one recruiter job at a time, in whole batched-prompt multiples"""
+    first = await evaluation_tasks_collection.find_one(
+        {"job_id": job_id, "status": "pending"}, sort=[("app_job_id", 1), ("_id", 1)]
+    )
+    if first is None:
+        return []
+    prompt_size = max(1, LLM_FEEDBACK_BATCH_SIZE)
+    size = -(-EVALUATION_BATCH_SIZE // prompt_size) * prompt_size
+    return await evaluation_tasks_collection.find(
+        {"job_id": job_id, "status": "pending", "app_job_id": first.get("app_job_id")}
+    ).sort("_id", 1).limit(size).to_list(None)
+
+
+async def _evaluate_task_batch(tasks: list):
+    """Evaluate one batch of tasks and record each task's outcome"""
+    now = _now()
+    task_ids = [task["_id"] for task in tasks]
+    await evaluation_tasks_collection.update_many(
+        {"_id": {"$in": task_ids}},
+        {"$set": {"status": "running", "updated_at": now}, "$inc": {"attempts": 1}}
+    )
+
+    app_ids = [task["application_id"] for task in tasks]
+    applications = {
+        app["_id"]: app
+        for app in await applications_collection.find({"_id": {"$in": app_ids}}).to_list(None)
+    }
+    # Scored by an earlier (interrupted) run or by someone else: never re-score
+    to_evaluate = [app for app in applications.values() if app.get("score") is None]
+    # The shortlist was decided over the whole job in stage_job; jobs staged before that
+    # existed (stage None) fall back to a per-batch shortlist
+    shortlisted = None
+    if all(task.get("stage") for task in tasks):
+        shortlisted = {task["application_id"] for task in tasks if task["stage"] == "llm"}
+    results = {
+        result["application_id"]: result
+        for result in await evaluate_llm_feedback(to_evaluate, shortlisted=shortlisted)
+    }
+
+    ops = []
+    for task in tasks:
+        app = applications.get(task["application_id"])
+        result = results.get(str(task["application_id"]))
+        if app is None:
+            update = {"status": "skipped", "error": "Application not found"}
+        elif app.get("score") is not None:
+            update = {"status": "done", "error": None}
+        elif result is None:
+            update = {"status": "skipped", "error": "Parsed CV or JD unavailable"}
+        elif result["status"] == "success":
+            update = {"status": "done", "error": None}
+        else:
+            update = {"status": "failed", "error": result.get("error")}
+        update["updated_at"] = _now()
+        ops.append(UpdateOne({"_id": task["_id"]}, {"$set": update}))
+    if ops:
+        await evaluation_tasks_collection.bulk_write(ops, ordered=False)
+
+
+async def process_job(job: dict, worker_id: str):
+    """Run a claimed job batch by batch; completed tasks are never repeated"""
+    job_id = job["_id"]
+    if job.get("started_at") is None:
+        await evaluation_jobs_collection.update_one({"_id": job_id}, {"$set": {"started_at": _now()}})
+    # Tasks left running by a worker that died are retried
+    await evaluation_tasks_collection.update_many(
+        {"job_id": job_id, "status": "running"}, {"$set": {"status": "pending"}}
+    )
+
+    try:
+        if job.get("staged_at") is None:
+            await stage_job(job_id, worker_id)
+        while True:
+            current = await evaluation_jobs_collection.find_one({"_id": job_id}, {"cancel_requested": 1, "worker_id": 1})
+            if current is None or current.get("worker_id") != worker_id:
+                return  # deleted, or taken over after we went stale
+            if current.get("cancel_requested"):
+                await evaluation_tasks_collection.update_many(
+                    {"job_id": job_id, "status": "pending"}, {"$set": {"status": "cancelled", "updated_at": _now()}}
+                )
+                await _finish_job(job_id, "cancelled")
+                return
+
+            tasks = await _next_task_batch(job_id)
+            if not tasks:
+                break
+            await evaluation_jobs_collection.update_one({"_id": job_id}, {"$set": {"heartbeat_at": _now()}})
+            await _evaluate_task_batch(tasks)
+
+        await _finish_job(job_id, "completed")
+    except asyncio.CancelledError:
+        # Shutdown: hand the job back so the next worker resumes it right away
+        await evaluation_tasks_collection.update_many(
+            {"job_id": job_id, "status": "running"}, {"$set": {"status": "pending"}}
+        )
+        await evaluation_jobs_collection.update_one(
+            {"_id": job_id, "worker_id": worker_id}, {"$set": {"status": "queued", "worker_id": None}}
+        )
+        raise
+    except Exception as e:
+        print(f"Evaluation job {job_id} failed: {e}")
+        await evaluation_tasks_collection.update_many(
+            {"job_id": job_id, "status": "running"}, {"$set": {"status": "pending"}}
+        )
+        await _finish_job(job_id, "failed", str(e))
+
+
+async def run_worker(stop: asyncio.Event = None):
+    """Poll for queued jobs and process them one at a time until `stop` is set"""
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    stop = stop or asyncio.Event()
+    print(f"Evaluation worker {worker_id} started")
+    while not stop.is_set():
+        try:
+            job = await claim_next_job(worker_id)
+        except Exception as e:
+            print(f"Evaluation worker could not claim a job: {e}")
+            job = None
+        if job is None:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=EVALUATION_POLL_INTERVAL_S)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        await process_job(job, worker_id)
+
+
+_worker_task = None
+_worker_stop = None
+
+
+def start_inprocess_worker():
+    global _worker_task, _worker_stop
+    if EVALUATION_WORKER != "inprocess" or _worker_task is not None:
+        return
+    _worker_stop = asyncio.Event()
+    _worker_task = asyncio.create_task(run_worker(_worker_stop))
+
+
+async def stop_inprocess_worker():
+    global _worker_task
+    if _worker_task is None:
+        return
+    _worker_stop.set()
+    _worker_task.cancel()
+    try:
+        await _worker_task
+    except asyncio.CancelledError:
+        pass
+    _worker_task = None
+
+
+class EvaluationSubmission(BaseModel):
+    application_ids: Optional[List[str]] = None
+
+
+@router.post("/submit")
+async def submit_evaluation(submission: Optional[EvaluationSubmission] = None):
+    """Queue an evaluation job (all unscored applications unless application_ids is given)"""
+    job = await submit_evaluation_job(submission.application_ids if submission else None)
+    return {"job_id": str(job["_id"]), "status": job["status"], "total": job["total"]}
+
+
+@router.delete("/llm-cache")
+async def invalidate_llm_cache(current_template_only: bool = False):
+    """Drop cached LLM completions (all, or only those of the current single and batched feedback prompts)"""
+    deleted = await llm_cache.invalidate(
+        template_digests=[
+            template_hash(feedback_prompt.template), template_hash(batch_feedback_prompt.template)
+        ] if current_template_only else None
+    )
+    return {"deleted": deleted, "cache": llm_cache.stats()}
+
+
+async def _get_job(job_id: str) -> dict:
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+    job = await evaluation_jobs_collection.find_one({"_id": ObjectId(job_id)})
+    if not job:
+        raise HTTPException(status_code=404, detail="Evaluation job not found")
+    return job
+
+
+@router.get("/{job_id}")
+async def get_evaluation_job(job_id: str):
+    """Job status plus task counts per state"""
+    job = await _get_job(job_id)
+    return {**_serialize(job), "tasks": await task_counts(job["_id"])}
+
+
+@router.get("/{job_id}/tasks")
+async def get_evaluation_tasks(job_id: str, status: str = None, skip: int = 0, limit: int = 100):
+    job = await _get_job(job_id)
+    query = {"job_id": job["_id"]}
+    if status:
+        query["status"] = status
+    tasks = await evaluation_tasks_collection.find(query).skip(skip).limit(limit).to_list(None)
+    return {"tasks": [_serialize(task) for task in tasks]}
+
+
+@router.post("/{job_id}/cancel")
+async def cancel_evaluation_job(job_id: str):
+    """Queued jobs are cancelled at once; running jobs stop after the current batch"""
+    job = await _get_job(job_id)
+    if job["status"] in ("completed", "cancelled", "failed"):
+        return {"job_id": job_id, "status": job["status"]}
+
+    cancelled = await evaluation_jobs_collection.find_one_and_update(
+        {"_id": job["_id"], "status": "queued"},
+        {"$set": {"status": "cancelled", "cancel_requested": True, "finished_at": _now()}}
+    )
+    if cancelled:
+        await evaluation_tasks_collection.update_many(
+            {"job_id": job["_id"], "status": "pending"}, {"$set": {"status": "cancelled", "updated_at": _now()}}
+        )
+        return {"job_id": job_id, "status": "cancelled"}
+
+    await evaluation_jobs_collection.update_one({"_id": job["_id"]}, {"$set": {"cancel_requested": True}})
+    return {"job_id": job_id, "status": "cancelling"}
+
+
+if __name__ == "__main__":
+    # Separate worker process: python -m routes.evaluations (from backend/)
+    asyncio.run(run_worker())
@@ -0,0 +1,49 @@
+import numpy as np
+from utils.model_registry import model_fingerprint, SBERT_MODEL_NAME, SKILL2VEC_MODEL_NAME
+from .score import jd_side_features
+
+# Bump whenever the scorer's JD texts or vector definitions change; stale documents are ignored
+JD_FEATURE_VERSION = 1
+
+
+def jd_feature_models() -> str:
+    """Fingerprint of the models the JD vectors come from; a rebuilt Skill2Vec or a
+    different SBERT model makes stored vectors stale"""
+    return f"{model_fingerprint(SKILL2VEC_MODEL_NAME)}|{model_fingerprint(SBERT_MODEL_NAME)}"
+
+
+def vector_to_bytes(vec) -> bytes:
+    return np.asarray(vec, dtype=np.float32).tobytes()
+
+
+def bytes_to_vector(data) -> np.ndarray:
+    return np.frombuffer(bytes(data), dtype=np.float32)
+
+
+def build_jd_features(parsed_data: dict, structured: dict, skill2vec_model, sbert_model) -> dict:
+    """Compute the JD-side scoring vectors once, in the compact form stored on parsed_jd"""
+    features = jd_side_features(structured, parsed_data, skill2vec_model, sbert_model)
+    return {
+        "texts": [
+            {"text": text, "vector": vector_to_bytes(vec)}
+            for text, vec in features["text_vectors"].items()
+        ],
+        "required_vec": vector_to_bytes(features["required_vec"]),
+        "preferred_vec": vector_to_bytes(features["preferred_vec"])
+    }
+
+
+def load_jd_features(parsed_jd: dict):
+    """Decode the stored features of a parsed_jd document, or None if missing or stale"""
+    stored = parsed_jd.get("features")
+    if (
+        not stored
+        or parsed_jd.get("feature_version") != JD_FEATURE_VERSION
+        or parsed_jd.get("feature_models") != jd_feature_models()
+    ):
+        return None
+    return {
+        "text_vectors": {item["text"]: bytes_to_vector(item["vector"]) for item in stored.get("texts", [])},
+        "required_vec": bytes_to_vector(stored["required_vec"]),
+        "preferred_vec": bytes_to_vector(stored["preferred_vec"])
+    }
@@ -0,0 +1,138 @@
+import asyncio
+import datetime
+import hashlib
+
+import requests
+from bson import ObjectId
+
+from database import sync_db
+from utils.executors import parse_executor, run_inference
+from utils.model_registry import get_sbert, get_skill2vec
+from .parse_jd import parse_jd_pdf, extract_structured_values, JD_PARSER_VERSION
+from .jd_features import build_jd_features, jd_feature_models, JD_FEATURE_VERSION
+
+# Runs on the inference thread pool, so it uses the synchronous client
+jobs_collection = sync_db["jobs"]
+parsed_jd_collection = sync_db["parsed_jd"]
+
+
+def _jd_is_current(state: dict) -> bool:
+    return (
+        state.get("parser_version") == JD_PARSER_VERSION
+        and state.get("feature_version") == JD_FEATURE_VERSION
+        and state.get("feature_models") == jd_feature_models()
+    )
+
+def set_jd_parse_status(job_id, status: str, error: str = None):
+    """Parse status shown on the job (pending / parsed / failed)"""
+    jobs_collection.update_one({"_id": job_id}, {"$set": {"parse_status": status, "parse_error": error}})
+
+
+def parse_and_store_jd(job: dict, source_url: str, data: bytes):
+    """Parse JD PDF bytes, precompute its scoring features and upsert parsed_jd"""
+    job_id = str(job["_id"])
+
+    # Step 1: Parse raw JD text straight from the PDF bytes (regex work, on the parse process pool)
+    parsed_data = parse_executor.call(parse_jd_pdf, data)
+
+    # Step 2: Extract structured fields
+    structured = extract_structured_values(parsed_data, get_skill2vec())
+
+    # Step 3: Precompute JD-side scoring vectors so evaluation never recomputes them per candidate
+    features = build_jd_features(parsed_data, structured, get_skill2vec(), get_sbert())
+
+    parsed_jd_collection.update_one(
+        {"job_id": job_id},
+        {"$set": {
+            "recruiter_email": job["recruiter_email"],
+            "title": job["title"],
+            "company": job["company"],
+            "parsed_data": parsed_data,
+            "structured": structured,
+            "features": features,
+            "feature_version": JD_FEATURE_VERSION,
+            "feature_models": jd_feature_models(),
+            "source_url": source_url,
+            "content_hash": hashlib.sha256(data).hexdigest(),
+            "parser_version": JD_PARSER_VERSION,
+            "parsed_at": datetime.datetime.now(datetime.timezone.utc)
+        }},
+        upsert=True
+    )
+    set_jd_parse_status(job["_id"], "parsed")
+    return parsed_data, structured
+
+
+def parse_job_descriptions(job_ids=None, force: bool = False) -> list:
+    """Parse new or changed JD PDFs; unchanged ones (same URL or same content hash) are skipped.
+
+    `job_ids` restricts the run to those jobs (as string ids), e.g. the ones an evaluation needs.
+    """
+    query = {"job_description_pdf_url": {"$exists": True}}
+    if job_ids is not None:
+        query["_id"] = {"$in": [ObjectId(job_id) for job_id in job_ids if ObjectId.is_valid(job_id)]}
+    jobs = list(jobs_collection.find(query))
+
+    # Parse state of every JD parsed so far, fetched in one query
+    states = {
+        doc["job_id"]: doc
+        for doc in parsed_jd_collection.find(
+            {} if job_ids is None else {"job_id": {"$in": list(job_ids)}},
+            {"job_id": 1, "source_url": 1, "content_hash": 1, "parser_version": 1, "feature_version": 1,
+             "feature_models": 1}
+        )
+    }
+
+    parsed_results = []
+
+    for job in jobs:
+        job_id = str(job["_id"])
+        source_url = job["job_description_pdf_url"]
+        state = states.get(job_id, {})
+        try:
+            if not force and state.get("source_url") == source_url and _jd_is_current(state):
+                parsed_results.append({"job_id": job_id, "status": "unchanged"})
+                continue
+
+            # Download the JD PDF
+            response = requests.get(source_url)
+            if response.status_code != 200:
+                raise Exception("Failed to download JD")
+            content_hash = hashlib.sha256(response.content).hexdigest()
+
+            # Same bytes under a new URL: only the URL needs recording
+            if not force and state.get("content_hash") == content_hash and _jd_is_current(state):
+                parsed_jd_collection.update_one({"job_id": job_id}, {"$set": {"source_url": source_url}})
+                parsed_results.append({"job_id": job_id, "status": "unchanged"})
+                continue
+
+            parsed_data, structured = parse_and_store_jd(job, source_url, response.content)
+
+            # Collect response
+            parsed_results.append({
+                "job_id": job_id,
+                "recruiter_email": job["recruiter_email"],
+                "title": job["title"],
+                "company": job["company"],
+                "parsed_data": parsed_data,
+                "structured": structured,
+                "status": "parsed"
+            })
+
+        except Exception as e:
+            set_jd_parse_status(job["_id"], "failed", str(e))
+            parsed_results.append({
+                "job_id": str(job.get("_id")),
+                "error": str(e)
+            })
+    return parsed_results
+
+
+async def parse_uploaded_jd(job_id, data: bytes):
+    """Background task run on job creation: parse the received PDF bytes, no re-download"""
+    try:
+        job = await asyncio.to_thread(jobs_collection.find_one, {"_id": job_id})
+        await run_inference(parse_and_store_jd, job, job["job_description_pdf_url"], data)
+    except Exception as e:
+        print(f"Parsing uploaded JD {job_id} failed: {e}")
+        await asyncio.to_thread(set_jd_parse_status, job_id, "failed", str(e))
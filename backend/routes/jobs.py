@@ -1,17 +1,25 @@
 #backend/routes/jobs.py
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query, BackgroundTasks
 from models import JobPosting
-from database import jobs_collection, recruiters_collection, applications_collection, parsed_jd_collection, parsed_cv_collection
+from database import jobs_collection, recruiters_collection, applications_collection, parsed_jd_collection
 from utils.cloudinary_upload import upload_job_description
 from bson import ObjectId
 from typing import List, Optional
+import asyncio
 import datetime
-from .parse_jd import parse_jd_pdf,  extract_structured_values
-from .students import parse_all_uploaded_cvs
-from .score import evaluate_cv
-import requests
-import tempfile
-from .train_model import model
+from .jd_pipeline import parse_job_descriptions, parse_uploaded_jd
+from utils.executors import run_inference
+from utils.llm_limiter import invoke_llm
+from utils.llm_cache import cached_completion
+from utils.llm_feedback import parse_llm_feedback
+from utils.prompt_budget import (
+    compact_sections, fit_to_budget, prompt_size,
+    PROMPT_JD_TOKENS, PROMPT_CV_TEXT_TOKENS, PROMPT_CV_CHUNKS_TOKENS
+)
+from .evaluation_planner import (
+    evaluate_application_batch, summarize_result, manual_score, manual_score_update, cheap_score_update,
+    select_for_llm
+)
 from dotenv import load_dotenv
 import os
 
@@ -25,15 +33,13 @@ os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
 import warnings
 warnings.filterwarnings("ignore") 
 
-from sentence_transformers import SentenceTransformer
-sbert_model = SentenceTransformer("all-MiniLM-L6-v2")
-
 router = APIRouter()
 
 from urllib.parse import unquote
 
 @router.post("/create")
 async def create_job(
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     company: str = Form(...),
     description: str = Form(""),
@@ -48,7 +54,7 @@ async def create_job(
         decoded_email = unquote(recruiter_email.strip())
         
         # Verify recruiter exists
-        recruiter = recruiters_collection.find_one({"email": decoded_email})
+        recruiter = await recruiters_collection.find_one({"email": decoded_email})
         if not recruiter:
             raise HTTPException(status_code=404, detail="Recruiter not found")
         
@@ -73,8 +79,10 @@ async def create_job(
         if hasattr(job_description_file, 'size') and job_description_file.size and job_description_file.size > 10 * 1024 * 1024:
             raise HTTPException(status_code=422, detail="File size must be less than 10MB")
         
-        # Upload job description file
+        # Upload job description file, keeping the bytes for the background parse
         try:
+            jd_bytes = await job_description_file.read()
+            await job_description_file.seek(0)
             job_description_pdf_url = upload_job_description(job_description_file)
         except Exception as e:
             raise HTTPException(status_code=422, detail=f"Failed to upload job description: {str(e)}")
@@ -93,16 +101,20 @@ async def create_job(
             "job_description_pdf_url": job_description_pdf_url,
             "created_at": datetime.datetime.now(datetime.timezone.utc),
             "is_active": True,
-            "application_count": 0  # Fixed: Initialize application count
+            "application_count": 0,  # Fixed: Initialize application count
+            "parse_status": "pending"
         }
         
-        result = jobs_collection.insert_one(job_data)
+        result = await jobs_collection.insert_one(job_data)
         
         # Update recruiter's job count
-        recruiters_collection.update_one(
+        await recruiters_collection.update_one(
             {"email": decoded_email},  # Fixed: Use decoded email
             {"$inc": {"jobs_posted": 1}}
         )
+
+        # Parse the JD right away so the job is ready to score
+        background_tasks.add_task(parse_uploaded_jd, result.inserted_id, jd_bytes)
         
         return {
             "message": "Job created successfully", 
@@ -121,57 +133,10 @@ async def create_job(
 parsed_jobs = []
 
 @router.get("/parse-all-jds")
-async def parse_all_job_descriptions():
+async def parse_all_job_descriptions(force: bool = False):
+    """Parse new or changed JD PDFs; unchanged ones (same URL or same content hash) are skipped"""
     global parsed_jobs
-    jobs = list(jobs_collection.find({"job_description_pdf_url": {"$exists": True}}))
-    
-    parsed_results = []
-
-    for job in jobs:
-        try:
-            #if parsed_jd_collection.find_one({"job_id": str(job["job_id"])}):
-                #continue  # Skip if already parsed
-            
-            # Download the JD PDF
-            response = requests.get(job["job_description_pdf_url"])
-            if response.status_code != 200:
-                raise Exception("Failed to download JD")
-
-            # Save PDF to temp file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                tmp.write(response.content)
-                file_path = tmp.name
-
-            # Step 1: Parse raw JD text
-            parsed_data = parse_jd_pdf(file_path)
-
-            # Step 2: Extract structured fields
-            structured = extract_structured_values(parsed_data,model)
-
-            parsed_jd_collection.insert_one({
-                "job_id": str(job["_id"]),
-                "recruiter_email": job["recruiter_email"],
-                "title": job["title"],
-                "company": job["company"],
-                "parsed_data": parsed_data,
-                "structured": structured
-            });
-
-            # Collect response
-            parsed_results.append({
-                "job_id": str(job["_id"]),
-                "recruiter_email": job["recruiter_email"],
-                "title": job["title"],
-                "company": job["company"],
-                "parsed_data": parsed_data,
-                "structured": structured
-            })
-
-        except Exception as e:
-            parsed_results.append({
-                "job_id": str(job.get("_id")),
-                "error": str(e)
-            })
+    parsed_results = await run_inference(parse_job_descriptions, force=force)
     parsed_jobs = parsed_results
     return {"results": parsed_results}
   
@@ -179,13 +144,13 @@ async def parse_all_job_descriptions():
 async def list_jobs(skip: int = 0, limit: int = 20, active_only: bool = True):
     """List all jobs with pagination"""
     query = {"is_active": True} if active_only else {}
-    jobs = list(jobs_collection.find(query).skip(skip).limit(limit).sort("created_at", -1))
+    jobs = await jobs_collection.find(query).skip(skip).limit(limit).sort("created_at", -1).to_list(None)
     
     for job in jobs:
         job["_id"] = str(job["_id"])
         job["created_at"] = job["created_at"].isoformat() if job.get("created_at") else None
     
-    total_jobs = jobs_collection.count_documents(query)
+    total_jobs = await jobs_collection.count_documents(query)
     
     return {
         "jobs": jobs,
@@ -198,7 +163,7 @@ async def list_jobs(skip: int = 0, limit: int = 20, active_only: bool = True):
 async def get_job_details(job_id: str):
     """Get detailed information about a specific job"""
     try:
-        job = jobs_collection.find_one({"_id": ObjectId(job_id)})
+        job = await jobs_collection.find_one({"_id": ObjectId(job_id)})
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
         
@@ -206,7 +171,7 @@ async def get_job_details(job_id: str):
         job["created_at"] = job["created_at"].isoformat() if job.get("created_at") else None
         
         # Get application count for this job
-        application_count = applications_collection.count_documents({"job_id": ObjectId(job_id)})
+        application_count = await applications_collection.count_documents({"job_id": ObjectId(job_id)})
         job["application_count"] = application_count
         
         return job
@@ -217,13 +182,13 @@ async def get_job_details(job_id: str):
 @router.get("/recruiter/{recruiter_email}")
 async def get_recruiter_jobs(recruiter_email: str):
     """Get all jobs posted by a specific recruiter"""
-    jobs = list(jobs_collection.find({"recruiter_email": recruiter_email}).sort("created_at", -1))
+    jobs = await jobs_collection.find({"recruiter_email": recruiter_email}).sort("created_at", -1).to_list(None)
     
     for job in jobs:
         job["_id"] = str(job["_id"])
         job["created_at"] = job["created_at"].isoformat() if job.get("created_at") else None
         # Add application count for each job
-        job["application_count"] = applications_collection.count_documents({"job_id": str(job["_id"])})
+        job["application_count"] = await applications_collection.count_documents({"job_id": str(job["_id"])})
     
     return {"jobs": jobs}
 
@@ -232,11 +197,11 @@ async def update_job_status(job_id: str, is_active: bool, recruiter_email: str):
     """Update job active status (only by the recruiter who posted it)"""
     try:
         # Verify the job belongs to the recruiter
-        job = jobs_collection.find_one({"_id": ObjectId(job_id), "recruiter_email": recruiter_email})
+        job = await jobs_collection.find_one({"_id": ObjectId(job_id), "recruiter_email": recruiter_email})
         if not job:
             raise HTTPException(status_code=404, detail="Job not found or unauthorized")
         
-        result = jobs_collection.update_one(
+        result = await jobs_collection.update_one(
             {"_id": ObjectId(job_id)},
             {"$set": {"is_active": is_active}}
         )
@@ -255,18 +220,18 @@ async def delete_job(job_id: str, recruiter_email: str):
     """Delete a job posting (only by the recruiter who posted it)"""
     try:
         # Verify the job belongs to the recruiter
-        job = jobs_collection.find_one({"_id": ObjectId(job_id), "recruiter_email": recruiter_email})
+        job = await jobs_collection.find_one({"_id": ObjectId(job_id), "recruiter_email": recruiter_email})
         if not job:
             raise HTTPException(status_code=404, detail="Job not found or unauthorized")
         
         # Delete the job
-        result = jobs_collection.delete_one({"_id": ObjectId(job_id)})
+        result = await jobs_collection.delete_one({"_id": ObjectId(job_id)})
         
         if result.deleted_count == 0:
             raise HTTPException(status_code=400, detail="Failed to delete job")
         
         # Update recruiter's job count
-        recruiters_collection.update_one(
+        await recruiters_collection.update_one(
             {"email": recruiter_email},
             {"$inc": {"jobs_posted": -1}}
         )
@@ -300,13 +265,13 @@ async def search_jobs(
     if job_type:
         search_query["job_type"] = job_type
     
-    jobs = list(jobs_collection.find(search_query).skip(skip).limit(limit).sort("created_at", -1))
+    jobs = await jobs_collection.find(search_query).skip(skip).limit(limit).sort("created_at", -1).to_list(None)
     
     for job in jobs:
         job["_id"] = str(job["_id"])
         job["created_at"] = job["created_at"].isoformat() if job.get("created_at") else None
     
-    total_jobs = jobs_collection.count_documents(search_query)
+    total_jobs = await jobs_collection.count_documents(search_query)
     
     return {
         "jobs": jobs,
@@ -318,75 +283,44 @@ async def search_jobs(
 @router.get("/parsed-jds")
 async def get_all_parsed_jds(job_id: str = Query(None)):
     query = {"job_id": job_id} if job_id else {}
-    jds = list(parsed_jd_collection.find(query, {"_id": 0}))
+    jds = await parsed_jd_collection.find(query, {"_id": 0, "features": 0}).to_list(None)
     return {"total": len(jds), "data": jds}
 
 
 @router.post("/evaluate-applications-by-cv/{cv_id}")
 async def evaluate_applications(cv_id: str):
-    applications = list(applications_collection.find({"cv_id": str(cv_id)}))
-    evaluated_results = []
-
-    for app in applications:
-        job_id = app.get("job_id")
-        student_email = app.get("student_email")
+    applications = await applications_collection.find({"cv_id": str(cv_id)}).to_list(None)
 
-        if not job_id or not student_email:
-            continue
-
-        # Make sure both parsed CV and parsed JD exist
-        await parse_all_job_descriptions()
-        await parse_all_uploaded_cvs()
+    # Parse only the CV/JDs these applications need, then score them as one batch
+    run = await evaluate_application_batch(applications)
 
-        parsed_cv_cur = parsed_cv_collection.find_one({"cv_id": ObjectId(cv_id)})
-        parsed_jd = parsed_jd_collection.find_one({"job_id": job_id})
-        #print(parsed_cv,parsed_jd)
-        if not parsed_cv_cur or not parsed_jd:
-            continue  # skip if either is missing
-
-        try:
-            result = evaluate_cv(
-                jd_structured=parsed_jd["structured"],
-                jd_sections=parsed_jd["parsed_data"],
-                parsed_resume=parsed_cv_cur["parsed"],
-                skill2vec_model=model,
-                sbert_model=sbert_model
-            )
-
-            applications_collection.update_one(
-                {"_id": app["_id"]},
-                {
-                    "$set": {
-                        "score": result["final_score"],
-                        "feedback": result["eligibility_reason"],
-                        "status": "evaluated"
-                    }
-                }
-            )
-
-            evaluated_results.append({
-                "course_score": result["course_score"],
-                "final_score": result["final_score"],
-                "skill_score": result["skill_score"]["final_score"],
-                "semantic_score": result["semantic_score"],
-            })
-
-        except Exception as e:
+    evaluated_results = []
+    for app in run["applications"]:
+        result = run["results"].get(app["_id"])
+        if result is None:
+            continue  # skip if either parsed CV or parsed JD is missing
+        if "error" in result:
             evaluated_results.append({
-                "student_email": student_email,
-                "job_id": job_id,
-                "error": str(e)
+                "student_email": app["student_email"],
+                "job_id": app["job_id"],
+                "error": result["error"]
             })
+        else:
+            evaluated_results.append(summarize_result(result))
 
+    if not evaluated_results:
+        raise HTTPException(status_code=404, detail="No evaluable applications for this CV")
     return evaluated_results[0]
     
 
 
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
+from utils.llm_backend import get_chat_model
 
-llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash", temperature=0.4, google_api_key=gemini)
+LLM_TEMPERATURE = 0.4
+# Gemini, or the offline stub when LLM_BACKEND=stub; LLM_MODEL is part of the LLM cache key
+LLM_MODEL, llm = get_chat_model("gemini-1.5-flash", LLM_TEMPERATURE, gemini)
 
 feedback_prompt = PromptTemplate.from_template("""
 You are an HR assistant evaluating a candidate's suitability for a job role.
@@ -428,22 +362,51 @@ Respond in the following format:
 from langchain_core.runnables import RunnableSequence
 feedback_chain = feedback_prompt | llm
 
-from .LLM import chunk_resume, embed_and_upsert_chunks, query_pinecone
-from langchain_core.runnables import Runnable  # or use your actual feedback_chain import
+# Several candidates of one job share a prompt, so the JD is sent once per batch; 1 disables batching
+LLM_FEEDBACK_BATCH_SIZE = int(os.getenv("LLM_FEEDBACK_BATCH_SIZE", "5"))
 
+batch_feedback_prompt = PromptTemplate.from_template("""
+You are an HR assistant evaluating several candidates for the same job role.
 
-async def process_and_evaluate_cv(
-    resume_id: str,
-    parsed_resume: dict,
-    parsed_data: dict,
-    structured: dict,
-    feedback_chain: Runnable
-):
-    # Step 1: Chunk and upsert resume
-    resume_chunks = chunk_resume(parsed_resume)
-    embed_and_upsert_chunks(resume_id=resume_id, chunks=resume_chunks)
+For EACH candidate below, independently:
+1. Score the candidate's resume **out of 100**, based only on your analysis strictly from 10-98.
+2. Provide specific **strengths** that align with the role.
+3. Mention **weaknesses** or areas of mismatch.
+4. Give a final recommendation: **Strong / Moderate / Weak fit**, with a short justification.
+
+Judge every candidate on their own resume only; do not compare candidates with each other.
+
+Job Description:
+{jd_text}
+
+Candidates:
+{candidates}
+
+Respond with one section per candidate, in the order given, using exactly this format:
+
+<<Candidate: ID>>
+
+<<Score:>>
+(Must be a plain integer between 10 and 98 only. Do NOT return decimal or percentage.)
 
-    # Step 2: Build query from parsed_data and structured
+<<Strengths:>>
+- ...
+
+<<Weaknesses:>>
+- ...
+
+<<Final Recommendation:>>
+<Strong / Moderate / Weak fit> — <your short justification>
+""")
+
+batch_feedback_chain = batch_feedback_prompt | llm
+
+from .LLM import chunk_resume, embed_and_upsert_chunks, embed_queries, query_resume_chunks
+from langchain_core.runnables import Runnable  # or use your actual feedback_chain import
+
+
+def build_jd_query(parsed_data: dict, structured: dict) -> str:
+    """Retrieval query for a JD, built from parsed_data and structured"""
     jd_query_parts = [
         parsed_data.get("job_role", ""),
         " ".join(parsed_data.get("required_skills", [])),
@@ -454,169 +417,365 @@ async def process_and_evaluate_cv(
         " ".join(structured.get("non_tech_skills", [])),
         structured.get("domain", "")
     ]
-    jd_query = " ".join([part for part in jd_query_parts if part])
-
-    # Step 3: Query Pinecone for top-matching resume chunks
-    cv_chunks = query_pinecone(jd_query)
-    
-
-    input_data = {
-        "jd_text": jd_query,
-        "cv_text": "\n".join(resume_chunks),               # make sure it's string
-        "cv_chunks": "\n".join(cv_chunks)        # make sure it's string
+    return " ".join([part for part in jd_query_parts if part])
+
+
+def build_jd_prompt_text(parsed_data: dict, structured: dict) -> str:
+    """JD section of the feedback prompt: one labelled line per section, each item listed
+    once across sections, capped at PROMPT_JD_TOKENS"""
+    sections = [
+        ("Role", [parsed_data.get("job_role", "")]),
+        ("Required skills", parsed_data.get("required_skills", [])),
+        ("Responsibilities", parsed_data.get("responsibilities", [])),
+        ("Preferred skills", parsed_data.get("preferred_skills", [])),
+        ("Branches", structured.get("branches", [])),
+        ("Technologies", structured.get("technologies", [])),
+        ("Other skills", structured.get("non_tech_skills", [])),
+        ("Domain", [structured.get("domain", "")])
+    ]
+    seen, lines = set(), []
+    for label, items in sections:
+        unique = []
+        for item in items:
+            key = " ".join(str(item or "").lower().split())
+            if key and key not in seen:
+                seen.add(key)
+                unique.append(" ".join(str(item).split()))
+        if unique:
+            lines.append(f"{label}: " + "; ".join(unique))
+    return "\n".join(fit_to_budget(lines, PROMPT_JD_TOKENS))
+
+
+def build_feedback_inputs(jd_text: str, resume_chunks: list, cv_chunks: list) -> dict:
+    """Prompt inputs with resume content deduped and each section within its token budget.
+
+    The retrieved chunks come first; the overview only adds what they do not already say.
+    """
+    sections = compact_sections(
+        {"cv_chunks": cv_chunks, "cv_text": resume_chunks},
+        {"cv_chunks": PROMPT_CV_CHUNKS_TOKENS, "cv_text": PROMPT_CV_TEXT_TOKENS}
+    )
+    return {
+        "jd_text": jd_text,
+        "cv_text": "\n".join(sections["cv_text"]),
+        "cv_chunks": "\n".join(sections["cv_chunks"])
     }
 
-    # Step 5: Generate feedback
-    feedback = await feedback_chain.ainvoke(input_data)
 
-    # Step 6: Print feedback
-    #print("FEEDBACK:\n")
-    #print(feedback["text"])
+async def embed_jd_queries(parsed_jds: dict) -> dict:
+    """job_id -> (jd_query, embedding); one batched encode for all jobs of a run"""
+    queries = {
+        job_id: build_jd_query(parsed_jd["parsed_data"], parsed_jd.get("structured", {}))
+        for job_id, parsed_jd in parsed_jds.items()
+    }
+    if not queries:
+        return {}
+    embeddings = await run_inference(embed_queries, list(queries.values()))
+    return {job_id: (query, embedding) for (job_id, query), embedding in zip(queries.items(), embeddings)}
 
-    return feedback.content
 
+async def retrieve_resume_context(resume_id: str, parsed_resume: dict, jd_embedding):
+    """(all resume chunks, chunks of this resume that best match the JD)"""
+    resume_chunks = chunk_resume(parsed_resume)
+    await run_inference(embed_and_upsert_chunks, resume_id=resume_id, chunks=resume_chunks)
+    cv_chunks = await run_inference(query_resume_chunks, resume_id, jd_embedding)
+    return resume_chunks, cv_chunks
 
 
-import re
+async def process_and_evaluate_cv(
+    resume_id: str,
+    parsed_resume: dict,
+    parsed_data: dict,
+    structured: dict,
+    feedback_chain: Runnable,
+    jd_query: str = None,
+    jd_embedding=None
+):
+    # Step 1-2: Build query from parsed_data and structured (callers evaluating many
+    # candidates for one job pass the query and its embedding, computed once per job)
+    if jd_query is None or jd_embedding is None:
+        jd_query = build_jd_query(parsed_data, structured)
+        jd_embedding = (await run_inference(embed_queries, [jd_query]))[0]
+
+    # Step 3: Chunk and upsert the resume, then retrieve its top-matching chunks
+    resume_chunks, cv_chunks = await retrieve_resume_context(resume_id, parsed_resume, jd_embedding)
+
+
+    # Step 4: Compact the prompt: no repeated resume text, each section within its budget
+    input_data = build_feedback_inputs(build_jd_prompt_text(parsed_data, structured), resume_chunks, cv_chunks)
+    size = prompt_size(input_data, feedback_prompt.template)
+    print(f"Feedback prompt for resume {resume_id}: ~{size['total']} tokens "
+          f"(jd {size['jd_text']}, overview {size['cv_text']}, chunks {size['cv_chunks']})")
+
+    # Step 5: Generate feedback (served from the LLM cache when these exact inputs were seen before)
+    feedback_text, parsed_feedback, _ = await cached_completion(
+        feedback_chain, input_data,
+        model=LLM_MODEL, temperature=LLM_TEMPERATURE, template=feedback_prompt.template,
+        invoke=invoke_llm, parse=parse_llm_feedback
+    )
+
+    return feedback_text, parsed_feedback
+
+
+def compact_resume_summary(parsed_resume: dict, cv_chunks: list) -> str:
+    """Short resume overview for batched prompts: branch, CGPA, skills and the JD-matching chunks"""
+    lines = []
+    if parsed_resume.get("branch"):
+        lines.append(f"Branch: {parsed_resume['branch']}")
+    if parsed_resume.get("cgpa"):
+        lines.append(f"CGPA: {parsed_resume['cgpa']}")
+    if parsed_resume.get("extracted_skills"):
+        lines.append("Skills: " + ", ".join(parsed_resume["extracted_skills"]))
+    lines.append("Top Matching Resume Chunks:")
+    lines.extend(f"- {chunk}" for chunk in compact_sections(
+        {"cv_chunks": cv_chunks}, {"cv_chunks": PROMPT_CV_CHUNKS_TOKENS}
+    )["cv_chunks"])
+    return "\n".join(lines)
+
+
+async def process_and_evaluate_cv_batch(jd_text: str, candidates: list):
+    """One LLM call for several candidates of the same job.
+
+    candidates: (candidate_id, resume summary) pairs. Returns the raw feedback and
+    candidate_id -> parsed feedback (None for candidates whose section did not parse).
+    """
+    candidate_ids = [candidate_id for candidate_id, _ in candidates]
+    input_data = {
+        "jd_text": jd_text,
+        "candidates": "\n\n".join(
+            f"<<Candidate: {candidate_id}>>\n{summary}" for candidate_id, summary in candidates
+        )
+    }
+    size = prompt_size(input_data, batch_feedback_prompt.template)
+    print(f"Batched feedback prompt for {len(candidates)} candidates: ~{size['total']} tokens "
+          f"(jd {size['jd_text']}, candidates {size['candidates']})")
+
+    def parse_complete(text):
+        # Only fully parsed batches are cached
+        sections = parse_llm_feedback(text, candidate_ids)
+        return sections if all(sections.values()) else None
+
+    feedback_text, parsed_sections, _ = await cached_completion(
+        batch_feedback_chain, input_data,
+        model=LLM_MODEL, temperature=LLM_TEMPERATURE, template=batch_feedback_prompt.template,
+        invoke=invoke_llm, parse=parse_complete
+    )
+    return feedback_text, parsed_sections or parse_llm_feedback(feedback_text, candidate_ids)
+
+
+UNSCORED_APPLICATIONS = {"$or": [{"score": {"$exists": False}}, {"score": None}]}
+
+
+async def evaluate_llm_feedback(applications: list, shortlisted: set = None) -> list:
+    """Manual + LLM evaluation of a batch of applications; one result per evaluated application.
+
+    `shortlisted` (application _ids) is the cascade decision made over a larger pool, e.g.
+    by the evaluation queue; without it the cascade runs over `applications` alone.
+    """
+    # Build the missing parsed CVs/JDs once and compute every manual score up front;
+    # scores are only stored per application once its LLM feedback is in
+    run = await evaluate_application_batch(applications, store=False)
+    # Cascade: only eligible candidates that pass the per-job cheap-score gates reach the
+    # LLM; everyone else keeps the cheap score, marked as such
+    if shortlisted is None:
+        shortlisted = select_for_llm(run["applications"], run["results"])
+    shortlisted_jds = {
+        app["job_id"] for app in run["applications"] if app["_id"] in shortlisted
+    }
+    jd_queries = await embed_jd_queries(
+        {job_id: parsed_jd for job_id, parsed_jd in run["parsed_jds"].items() if job_id in shortlisted_jds}
+    )
+    print(f"LLM cascade: {len(shortlisted)} of {len(run['applications'])} applications shortlisted for LLM feedback")
+
+    # Shortlisted candidates of the same job share prompts of up to LLM_FEEDBACK_BATCH_SIZE
+    groups = {}
+    for app in run["applications"]:
+        if app["_id"] in shortlisted:
+            groups.setdefault(app["job_id"], []).append(app)
+    batches = [
+        apps[start:start + max(1, LLM_FEEDBACK_BATCH_SIZE)]
+        for apps in groups.values()
+        for start in range(0, len(apps), max(1, LLM_FEEDBACK_BATCH_SIZE))
+    ]
 
-def parse_llm_feedback(text: str):
-    def extract_between(text, start_kw, end_kw):
-        start = text.find(start_kw)
-        if start == -1:
-            return None
-        start += len(start_kw)
-        end = text.find(end_kw, start) if end_kw else len(text)
-        return text[start:end].strip()
+    # Batches run concurrently; the LLM limiter caps in-flight calls and request rate
+    outcomes = await asyncio.gather(
+        *(_evaluate_llm_feedback_batch(batch, run, jd_queries) for batch in batches),
+        *(_store_cheap_score(app, run) for app in run["applications"] if app["_id"] not in shortlisted)
+    )
+    by_app = {}
+    for outcome in outcomes:
+        for result in (outcome if isinstance(outcome, list) else [outcome]):
+            if result is not None:
+                by_app[result["application_id"]] = result
+    # Results in application order
+    return [by_app[str(app["_id"])] for app in run["applications"] if str(app["_id"]) in by_app]
+
+
+def _result(app: dict, **fields) -> dict:
+    return {
+        "application_id": str(app["_id"]),
+        "student_email": app["student_email"],
+        "job_id": app["job_id"],
+        **fields
+    }
 
-    score_text = extract_between(text, "Score:", "Strengths:")
-    strengths_text = extract_between(text, "Strengths:", "Weaknesses:")
-    weaknesses_text = extract_between(text, "Weaknesses:", "Final Recommendation:")
-    recommendation_text = extract_between(text, "Final Recommendation:", None)
 
+async def _store_cheap_score(app: dict, run: dict):
+    """Final result for an application the cascade kept away from the LLM"""
+    if not run["parsed_cvs"].get(str(app["cv_id"])) or not run["parsed_jds"].get(app["job_id"]):
+        return None
+    manual_result = run["results"].get(app["_id"], {})
+    if "error" in manual_result:
+        return _result(app, stage="cheap", status="error", error=manual_result["error"])
     try:
-        match = re.search(r"\b([1-9][0-9])\b", score_text)  # match integers from 10–99
-        score = int(match.group(1)) if match else 0
-        print(score)
-        return {
-            "score": score,
-            "strengths": [
-                line.strip("- ").strip()
-                for line in strengths_text.splitlines()
-                if line.strip().startswith("-")
-            ],
-            "weaknesses": [
-                line.strip("- ").strip()
-                for line in weaknesses_text.splitlines()
-                if line.strip().startswith("-")
-            ],
-            "recommendation": recommendation_text.strip()
-        }
+        await applications_collection.update_one(
+            {"_id": app["_id"]}, {"$set": cheap_score_update(manual_result)}
+        )
     except Exception as e:
-        print("⚠️ Failed to parse:", e)
-        return None
+        return _result(app, stage="cheap", status="error", error=str(e))
+    return _result(app, stage="cheap", status="success")
 
 
+async def _store_llm_feedback(app: dict, manual_result: dict, feedback_text: str, parsed_feedback: dict):
+    """Combine the manual and LLM scores and store the application's final evaluation"""
+    parsed_feedback = parsed_feedback or {}
 
+    # Average of the manual scores, scaled to 100
+    manual = manual_score(manual_result)
 
-@router.post("/evaluate-llm-feedback")
-async def evaluate_llm_feedback_for_all():
-    await parse_all_job_descriptions()
-    await parse_all_uploaded_cvs()
+    # Combine scores
+    alpha = 0.2  # 40% weight to manual, 60% to LLM
+    llm_score = parsed_feedback.get("score", 60)
+    
+    if(manual>=30):
+        combined_score = round(alpha * manual + (1 - alpha) * llm_score, 2)
+    else:
+        combined_score = llm_score
+    
 
-    applications = list(applications_collection.find({
-        "$or": [{"score": {"$exists": False}}, {"score": None}]
-    }))
-    evaluated_results = []
+    if parsed_feedback:
+        await applications_collection.update_one(
+            {"_id": app["_id"]},
+    {
+    "$set": {
+        "score": combined_score,
+        "status": "evaluated",
+        "feedback": parsed_feedback.get("recommendation", ""),
+        "strengths": parsed_feedback.get("strengths", []),
+        "weaknesses": parsed_feedback.get("weaknesses", []),
+        "evaluation_stage": "llm"
+    }
+    }
+    )
+        
+    else:
+        # fallback to the manual score and raw feedback if parsing fails
+        await applications_collection.update_one(
+            {"_id": app["_id"]},
+            {"$set": {**manual_score_update(manual_result), "feedback": feedback_text, "evaluation_stage": "llm"}}
+        )
 
-    for app in applications:
-        job_id = app.get("job_id")
-        student_email = app.get("student_email")
 
-        if not job_id or not student_email:
-            continue
-        
-        parsed_cv_cur = parsed_cv_collection.find_one({"student_email": student_email})
-        parsed_jd = parsed_jd_collection.find_one({"job_id": job_id})
+async def _evaluate_llm_feedback_one(app: dict, run: dict, jd_queries: dict):
+    job_id = app["job_id"]
 
-        if not parsed_cv_cur or not parsed_jd:
-            continue  # Skip if either is missing
+    parsed_cv_cur = run["parsed_cvs"].get(str(app["cv_id"]))
+    parsed_jd = run["parsed_jds"].get(job_id)
 
-        # Prepare inputs
-        resume_id = str(parsed_cv_cur["cv_id"])
-        parsed_resume = parsed_cv_cur["parsed"]
+    if not parsed_cv_cur or not parsed_jd:
+        return None  # Skip if either is missing
 
-        parsed_data = parsed_jd["parsed_data"]
-        structured = parsed_jd.get("structured", {})
+    # Prepare inputs
+    resume_id = str(parsed_cv_cur["cv_id"])
+    parsed_resume = parsed_cv_cur["parsed"]
 
-        # Generate feedback
-        try:
-            feedback_text = await process_and_evaluate_cv(
-                resume_id=resume_id,
-                parsed_resume=parsed_resume,
-                parsed_data=parsed_data,
-                structured=structured,
-                feedback_chain=feedback_chain
-            )
+    parsed_data = parsed_jd["parsed_data"]
+    structured = parsed_jd.get("structured", {})
 
-            parsed_feedback =  parse_llm_feedback(feedback_text) or {}
-
-            # Fetch manual score (already stored by previous pipeline)
-            result = await evaluate_applications(resume_id)
-
-            course = result.get("course_score", 0.0)
-            skill = result.get("skill_score", 0.0)
-            semantic = result.get("semantic_score", 0.0)
-            extra = result.get("final_score", 0.0)
-
-            # Scale average to 100
-            manual_score = 100 * (course + skill + semantic + extra) / 4
-
-
-
-            # Combine scores
-            alpha = 0.2  # 40% weight to manual, 60% to LLM
-            llm_score = parsed_feedback.get("score", 60)
-            
-            if(manual_score>=30):
-                combined_score = round(alpha * manual_score + (1 - alpha) * llm_score, 2)
-            else:
-                combined_score = llm_score
-            
-
-            if parsed_feedback:
-                applications_collection.update_one(
-                    {"_id": app["_id"]},
-            {
-            "$set": {
-                "score": combined_score,
-                "feedback": parsed_feedback.get("recommendation", ""),
-                "strengths": parsed_feedback.get("strengths", []),
-                "weaknesses": parsed_feedback.get("weaknesses", [])
-            }
-            }
-            )
-                
-            else:
-                # fallback to raw feedback if parsing fails
-                applications_collection.update_one(
-                    {"_id": app["_id"]},
-                    {"$set": {"feedback": feedback_text}}
-                )
-            evaluated_results.append({
-                "student_email": student_email,
-                "job_id": job_id,
-                "status": "success"
-            })
+    # Generate feedback
+    try:
+        manual_result = run["results"].get(app["_id"], {})
+        if "error" in manual_result:
+            raise Exception(manual_result["error"])
+
+        feedback_text, parsed_feedback = await process_and_evaluate_cv(
+            resume_id=resume_id,
+            parsed_resume=parsed_resume,
+            parsed_data=parsed_data,
+            structured=structured,
+            feedback_chain=feedback_chain,
+            jd_query=jd_queries[job_id][0],
+            jd_embedding=jd_queries[job_id][1]
+        )
+        await _store_llm_feedback(app, manual_result, feedback_text, parsed_feedback)
+        return _result(app, stage="llm", status="success")
+    except Exception as e:
+        return _result(app, status="error", error=str(e))
 
-        except Exception as e:
-            evaluated_results.append({
-                "student_email": student_email,
-                "job_id": job_id,
-                "status": "error",
-                "error": str(e)
-            })
 
-    return {"evaluated": len(evaluated_results), "results": evaluated_results}
+async def _evaluate_llm_feedback_batch(apps: list, run: dict, jd_queries: dict) -> list:
+    """LLM feedback for several applications to one job from a single prompt.
 
+    Candidates whose section of the response cannot be parsed go through the
+    single-candidate path instead.
+    """
+    if len(apps) == 1:
+        return [await _evaluate_llm_feedback_one(apps[0], run, jd_queries)]
 
+    job_id = apps[0]["job_id"]
+    if not run["parsed_jds"].get(job_id):
+        return []
+    apps = [app for app in apps if run["parsed_cvs"].get(str(app["cv_id"]))]
+    jd_embedding = jd_queries[job_id][1]
+    parsed_jd = run["parsed_jds"][job_id]
+    jd_text = build_jd_prompt_text(parsed_jd["parsed_data"], parsed_jd.get("structured", {}))
 
+    try:
+        contexts = await asyncio.gather(*(
+            retrieve_resume_context(
+                str(run["parsed_cvs"][str(app["cv_id"])]["cv_id"]),
+                run["parsed_cvs"][str(app["cv_id"])]["parsed"],
+                jd_embedding
+            )
+            for app in apps
+        ))
+        # Short per-batch ids keep the response format simple for the model
+        candidates = [
+            (f"C{i + 1}", compact_resume_summary(run["parsed_cvs"][str(app["cv_id"])]["parsed"], cv_chunks))
+            for i, (app, (_, cv_chunks)) in enumerate(zip(apps, contexts))
+        ]
+        feedback_text, sections = await process_and_evaluate_cv_batch(jd_text, candidates)
+    except Exception as e:
+        # The batched call itself failed: every candidate gets its own prompt instead
+        print(f"Batched feedback for job {job_id} failed ({e}); evaluating {len(apps)} candidates singly")
+        return list(await asyncio.gather(*(
+            _evaluate_llm_feedback_one(app, run, jd_queries) for app in apps
+        )))
+
+    results, fallback = [], []
+    for app, (candidate_id, _) in zip(apps, candidates):
+        parsed_feedback = sections.get(candidate_id)
+        if not parsed_feedback:
+            fallback.append(app)
+            continue
+        try:
+            await _store_llm_feedback(app, run["results"][app["_id"]], feedback_text, parsed_feedback)
+            results.append(_result(app, stage="llm", status="success"))
+        except Exception as e:
+            results.append(_result(app, status="error", error=str(e)))
+
+    if fallback:
+        print(f"Batched feedback for job {job_id}: {len(fallback)} of {len(apps)} candidates unparsed, retrying singly")
+        results.extend(await asyncio.gather(*(
+            _evaluate_llm_feedback_one(app, run, jd_queries) for app in fallback
+        )))
+    return results
+
+
+@router.post("/evaluate-llm-feedback")
+async def evaluate_llm_feedback_for_all():
+    """Evaluate every unscored application within this request; use /api/evaluations for large batches"""
+    applications = await applications_collection.find(UNSCORED_APPLICATIONS).to_list(None)
+    evaluated_results = await evaluate_llm_feedback(applications)
+    return {"evaluated": len(evaluated_results), "results": evaluated_results}
@@ -1,7 +1,13 @@
-import fitz
 import re
 import json
 import unicodedata
+from .skill_index import get_skill_index
+from utils.keyword_matcher import get_matcher
+from utils.pdf_source import pdf_text
+
+# Bump whenever parsing output changes so stored JDs get re-parsed
+JD_PARSER_VERSION = 1
+
 TECH_KEYWORDS = [
     "c", "c++", "java", "python", "go", "ruby", "rust", "kotlin", "typescript", "javascript", "php", "scala", "perl", "swift",
     "html", "css", "react", "angular", "vue", "next.js", "node.js", "express.js", "django", "flask", "spring boot",
@@ -15,12 +21,8 @@ TECH_KEYWORDS = [
 ]
 
 import re
-import spacy
 from typing import Dict
 
-# Load models
-nlp = spacy.load("en_core_web_sm")
-
 # --- Branches ---
 BRANCH_KEYWORDS = [
     "computer science", "information technology", "data science", "artificial intelligence",
@@ -81,17 +83,23 @@ DOMAIN_KEYWORDS = {
     "Manufacturing": ["factory", "industrial", "mechanical", "automation", "production", "assembly line"]
 }
 
+# Rank of the first domain each keyword belongs to; domains are checked in declaration order
+DOMAIN_RANK = {}
+for _rank, _keywords in enumerate(DOMAIN_KEYWORDS.values()):
+    for _kw in _keywords:
+        DOMAIN_RANK.setdefault(_kw.lower(), _rank)
+DOMAIN_NAMES = list(DOMAIN_KEYWORDS)
+
 def detect_domain(text: str) -> str:
-    text_lower = text.lower()
-    for domain, keywords in DOMAIN_KEYWORDS.items():
-        if any(keyword in text_lower for keyword in keywords):
-            return domain
-    return "General"  # fallback
+    # Plain substring semantics, one pass over the text for all domains
+    hits = get_matcher(list(DOMAIN_RANK), word_boundary=False).find_all(text)
+    if not hits:
+        return "General"  # fallback
+    return DOMAIN_NAMES[min(DOMAIN_RANK[kw] for kw in hits)]
 
 import re
 from typing import Dict
 
-import fitz
 import re
 import json
 import unicodedata
@@ -207,10 +215,9 @@ def extract_metadata(raw_text: str) -> dict:
 
     return metadata
 
-def parse_jd_pdf(file_path: str) -> dict:
-    doc = fitz.open(file_path)
-    text = "\n".join([page.get_text() for page in doc])
-    doc.close()
+def parse_jd_pdf(source) -> dict:
+    """Parse a JD PDF given as a path, raw bytes or a binary buffer"""
+    text = pdf_text(source)
 
     raw_sections = extract_jd_sections_from_text(text)
     structured = clean_and_structure_jd_sections(raw_sections)
@@ -222,31 +229,12 @@ def parse_jd_pdf(file_path: str) -> dict:
 
 
 def extract_technologies_from_text(jd_text: str, model, threshold=0.8, top_k=5):
+    # A vocab skill matches when it and some JD word contain one another and are similar enough;
+    # the prebuilt index keeps this linear in the number of distinct JD words
     jd_words = jd_text.lower().split()
-    matched_skills = set()
-
-    # Go through each vocab skill and check if it appears approximately in JD
-    for vocab_skill in model.wv.index_to_key:
-        for word in jd_words:
-            if word in vocab_skill or vocab_skill in word:
-                try:
-                    sim = model.wv.similarity(word, vocab_skill)
-                    if sim >= threshold:
-                        matched_skills.add(vocab_skill)
-                        break
-                except KeyError:
-                    continue
-
-    return sorted(matched_skills)
+    return get_skill_index(model).match(jd_words, threshold=threshold)
 
 # --- Extract Structured Fields ---
-def detect_domain(text: str) -> str:
-    text_lower = text.lower()
-    for domain, keywords in DOMAIN_KEYWORDS.items():
-        if any(keyword in text_lower for keyword in keywords):
-            return domain
-    return "General"  # fallback
-
 import re
 from typing import Dict
 
@@ -265,17 +253,13 @@ def extract_structured_values(sections: Dict, model) -> Dict:
     }
 
     # Branches (exact match from pre-defined list)
-    for branch in BRANCH_KEYWORDS:
-        if re.search(rf"\b{re.escape(branch)}\b", full_text, re.IGNORECASE):
-            structured["branches"].append(branch.title())
+    structured["branches"] = [branch.title() for branch in get_matcher(BRANCH_KEYWORDS).find_all(full_text)]
 
     # Technologies (semantic from trained model)
     structured["technologies"] = extract_technologies_from_text(full_text, model)
 
     # Non-tech keywords (static match from list)
-    for kw in NON_TECH_KEYWORDS:
-        if re.search(rf"\b{re.escape(kw)}\b", full_text, re.IGNORECASE):
-            structured["non_tech_skills"].append(kw)
+    structured["non_tech_skills"] = get_matcher(NON_TECH_KEYWORDS).find_all(full_text)
 
     # CGPA (regex-based)
     cgpa_match = re.search(r"(?:CGPA|CPI|GPA)[^0-9]{0,5}(\d{1,2}(?:\.\d{1,2})?)", full_text, re.IGNORECASE)
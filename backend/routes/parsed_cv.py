@@ -1,9 +1,10 @@
-import fitz
 import re
-import spacy
 import json
+from utils.keyword_matcher import get_matcher
+from utils.pdf_source import pdf_text
 
-nlp = spacy.load("en_core_web_sm")
+# Bump whenever parsing output changes so stored CVs get re-parsed
+CV_PARSER_VERSION = 1
 
 TECH_KEYWORDS = [
     "c", "c++", "java", "python", "go", "ruby", "rust", "kotlin", "typescript", "javascript", "php", "scala", "perl", "swift",
@@ -17,9 +18,9 @@ TECH_KEYWORDS = [
     "git", "github", "bitbucket", "jira", "agile", "scrum", "ci/cd", "rest api", "graphql", "json", "yaml", "xml"
 ]
 
-def extract_text_from_pdf(pdf_path):
-    doc = fitz.open(pdf_path)
-    return "\n".join([page.get_text() for page in doc])
+def extract_text_from_pdf(source):
+    # source: path, raw bytes or binary buffer; bytes are read from memory
+    return pdf_text(source)
 
 def extract_sections(text):
     sections = {}
@@ -154,19 +155,10 @@ def extract_degree_and_cgpa(text, education_data):
 def extract_flat_skills(skills_dict: dict, keyword_list: list) -> list:
     """Flatten and match resume skills against TECH_KEYWORDS"""
     combined = " ".join(skill.lower() for skills in skills_dict.values() for skill in skills)
-    matched = set()
-    for kw in keyword_list:
-        kw_pattern = re.escape(kw.lower())
-        if re.search(r"[^\w\s]", kw):
-            pattern = rf"(?<!\w){kw_pattern}(?!\w)"
-        else:
-            pattern = rf"\b{kw_pattern}\b"
-        if re.search(pattern, combined):
-            matched.add(kw.lower())
-    return sorted(matched)
+    return sorted(get_matcher(keyword_list).find_all(combined))
 
-def parse_cv(pdf_path):
-    raw_text = extract_text_from_pdf(pdf_path)
+def parse_cv(source):
+    raw_text = extract_text_from_pdf(source)
     sections = extract_sections(raw_text)
     education_data = extract_education(sections.get("education", ""))
     degree, cgpa = extract_degree_and_cgpa(raw_text, education_data)
@@ -189,3 +181,8 @@ def parse_cv(pdf_path):
     }
     return structured
 
+
+
+def parse_cv_bytes(data: bytes) -> dict:
+    """Process-pool entry point: PyMuPDF + regex extraction for one downloaded CV, in memory"""
+    return parse_cv(data)
@@ -11,7 +11,7 @@ router = APIRouter()
 async def register_recruiter(recruiter: RecruiterRegistration):
     """Register a new recruiter"""
     # Check if recruiter already exists
-    existing_recruiter = recruiters_collection.find_one({"email": recruiter.email})
+    existing_recruiter = await recruiters_collection.find_one({"email": recruiter.email})
     if existing_recruiter:
         raise HTTPException(status_code=400, detail="Recruiter with this email already exists")
     
@@ -19,7 +19,7 @@ async def register_recruiter(recruiter: RecruiterRegistration):
     recruiter_data = recruiter.model_dump()
     recruiter_data["jobs_posted"] = 0
 
-    result = recruiters_collection.insert_one(recruiter_data)
+    result = await recruiters_collection.insert_one(recruiter_data)
     return {"message": "Recruiter registered successfully", "recruiter_id": str(result.inserted_id)}
 
 @router.get("/profile/{email}")
@@ -28,7 +28,7 @@ async def get_recruiter_profile(email: str):
     # Fixed: Decode URL-encoded email
     decoded_email = unquote(email)
     
-    recruiter = recruiters_collection.find_one({"email": decoded_email})
+    recruiter = await recruiters_collection.find_one({"email": decoded_email})
     if not recruiter:
         raise HTTPException(status_code=404, detail="Recruiter not found")
     
@@ -41,7 +41,7 @@ class RecruiterLogin(BaseModel):
 
 @router.post("/login")
 async def login_recruiter(data: RecruiterLogin):
-    recruiter = recruiters_collection.find_one({"email": data.email, "password": data.password})
+    recruiter = await recruiters_collection.find_one({"email": data.email, "password": data.password})
     if not recruiter:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     return {"message": "Login successful", "email": recruiter["email"]}
@@ -52,7 +52,7 @@ async def verify_recruiter_exists(email: str):
     # Fixed: Decode URL-encoded email
     decoded_email = unquote(email)
     
-    recruiter = recruiters_collection.find_one({"email": decoded_email}, {"_id": 1})
+    recruiter = await recruiters_collection.find_one({"email": decoded_email}, {"_id": 1})
     exists = recruiter is not None
     
     return {"exists": exists, "email": decoded_email}
@@ -1,5 +1,4 @@
 import re
-from .train_model import model
 
 BRANCH_EQUIVALENTS = {
     "cs": ["computer science", "cse", "computer science and engineering", "cs", "it", "information technology"],
@@ -58,46 +57,68 @@ def check_eligibility(jd_structured: dict, parsed_cv: dict) -> (bool, str):
 
     return True, "Eligible"
 
-from sentence_transformers import SentenceTransformer, util
 from rapidfuzz import fuzz
-
-def course_match_score(
-    jd_structured: dict,
-    jd_sections: dict,
-    cv_courses: dict,
-    sbert_model,
-    top_k: int = 5
-):
+import numpy as np
+from utils.embedding_cache import cached_encode
+
+def encode_texts(texts, sbert_model, batch_size: int = 64, known: dict = None):
+    """Encode the distinct texts in one padded batch.
+
+    Returns (index, matrix) where index maps text -> row and rows are unit vectors,
+    so cosine similarity against any query is a single matrix product. Texts found in
+    `known` (text -> unit vector, e.g. stored JD features) are not re-encoded.
+    """
+    known = known or {}
+    unique = list(dict.fromkeys(texts))
+    if not unique:
+        return {}, np.zeros((0, 0), dtype=np.float32)
+
+    fresh = [t for t in unique if t not in known]
+    rows = {}
+    if fresh:
+        embs = cached_encode(fresh, sbert_model, batch_size=batch_size)
+        norms = np.linalg.norm(embs, axis=1, keepdims=True)
+        rows = dict(zip(fresh, embs / np.where(norms == 0, 1.0, norms)))
+
+    matrix = np.vstack([rows[t] if t in rows else known[t] for t in unique]).astype(np.float32, copy=False)
+    return {text: i for i, text in enumerate(unique)}, matrix
+
+def _ensure_encoded(texts, embeddings, sbert_model):
+    # Callers that already encoded a CV/JD pair pass `embeddings`; anything else is encoded here in one batch
+    if embeddings is None or any(t not in embeddings[0] for t in texts):
+        return encode_texts(texts, sbert_model)
+    return embeddings
+
+def _lookup_sims(query: str, texts: list, embeddings):
+    index, matrix = embeddings
+    return matrix[[index[t] for t in texts]] @ matrix[index[query]]
+
+def _unit_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def _to_text(val):
     # Safely flatten any list fields to strings
-    def to_text(val):
-        return " ".join(val) if isinstance(val, list) else str(val)
+    return " ".join(val) if isinstance(val, list) else str(val)
 
+def course_jd_text(jd_structured: dict, jd_sections: dict) -> str:
     jd_text_parts = [
         " ".join(jd_structured.get("technologies", [])),
-        to_text(jd_sections.get("job_role", "")),
-        to_text(jd_sections.get("required_skills", "")),
-        to_text(jd_sections.get("preferred_skills", ""))
+        _to_text(jd_sections.get("job_role", "")),
+        _to_text(jd_sections.get("required_skills", "")),
+        _to_text(jd_sections.get("preferred_skills", ""))
     ]
+    return " ".join([part for part in jd_text_parts if part.strip()])
 
-    jd_text = " ".join([part for part in jd_text_parts if part.strip()])
-
-
-    if not jd_text or not cv_courses:
-        return {"score": 0.0, "top_matches": []}
-
+def flatten_cv_courses(cv_courses: dict) -> list:
     # Flatten CV course titles
     cv_course_list = []
     for group in cv_courses.values():
         cv_course_list.extend(group)
+    return cv_course_list
 
-    if not cv_course_list:
-        return {"score": 0.0, "top_matches": []}
-
-    # SBERT scoring
-    jd_emb = sbert_model.encode(jd_text, convert_to_tensor=True)
-    course_embs = sbert_model.encode(cv_course_list, convert_to_tensor=True)
-    sbert_scores = util.cos_sim(jd_emb, course_embs)[0].cpu().numpy()
-
+def _course_match_result(cv_course_list: list, sbert_scores, jd_text: str, top_k: int) -> dict:
     sbert_matches = [
         {"course": course, "score": float(score), "match_type": "sbert"}
         for course, score in zip(cv_course_list, sbert_scores)
@@ -132,13 +153,50 @@ def course_match_score(
         ]
     }
 
+def course_match_score(
+    jd_structured: dict,
+    jd_sections: dict,
+    cv_courses: dict,
+    sbert_model,
+    top_k: int = 5,
+    embeddings=None
+):
+    jd_text = course_jd_text(jd_structured, jd_sections)
+
+    if not jd_text or not cv_courses:
+        return {"score": 0.0, "top_matches": []}
+
+    cv_course_list = flatten_cv_courses(cv_courses)
+
+    if not cv_course_list:
+        return {"score": 0.0, "top_matches": []}
+
+    # SBERT scoring
+    embeddings = _ensure_encoded([jd_text] + cv_course_list, embeddings, sbert_model)
+    sbert_scores = _lookup_sims(jd_text, cv_course_list, embeddings)
+
+    return _course_match_result(cv_course_list, sbert_scores, jd_text, top_k)
+
 
 import numpy as np
 from numpy.linalg import norm
 
 
-def get_avg_vector(skills, model): # vec_model
-    vectors = [model.wv[s] for s in skills if s in model.wv]
+def get_avg_vector(skills, model, cache: dict = None): # vec_model
+    # FastText builds OOV vectors from subword n-grams, so unseen skills still contribute.
+    # `cache` lets batch scoring look each distinct skill up only once.
+    vectors = []
+    for s in skills:
+        if not isinstance(s, str) or not s.strip():
+            continue
+        if cache is not None and s in cache:
+            vec = cache[s]
+        else:
+            vec = model.wv.get_vector(s) if s in model.wv else None
+            if cache is not None:
+                cache[s] = vec
+        if vec is not None and norm(vec) > 0:
+            vectors.append(vec)
     return np.mean(vectors, axis=0) if vectors else np.zeros(model.vector_size)
 
 def cosine_similarity(vec1, vec2):
@@ -146,14 +204,19 @@ def cosine_similarity(vec1, vec2):
         return 0.0
     return np.dot(vec1, vec2) / (norm(vec1) * norm(vec2))
 
-def score_cv_against_jd(cv_skills, required_techs, preferred_techs, model, alpha=0.7):
+def score_cv_against_jd(cv_skills, required_techs, preferred_techs, model, alpha=0.7, required_vec=None, preferred_vec=None):
+    # required_vec/preferred_vec: precomputed JD averages (see jd_side_features)
     cv_vec = get_avg_vector(cv_skills, model)
-    required_vec = get_avg_vector(required_techs, model)
-    preferred_vec = get_avg_vector(preferred_techs, model)
+    if required_vec is None:
+        required_vec = get_avg_vector(required_techs, model)
+    if preferred_vec is None:
+        preferred_vec = get_avg_vector(preferred_techs, model)
 
     required_score = cosine_similarity(cv_vec, required_vec)
     preferred_score = cosine_similarity(cv_vec, preferred_vec)
+    return _skill_score_result(required_score, preferred_score, alpha)
 
+def _skill_score_result(required_score, preferred_score, alpha=0.7):
     final_score = alpha * required_score + (1 - alpha) * preferred_score
     return {
     "required_score": float(round(required_score, 3)),
@@ -162,22 +225,25 @@ def score_cv_against_jd(cv_skills, required_techs, preferred_techs, model, alpha
     }
 
 import re
-from sentence_transformers.util import cos_sim
 
 def clean_text(text):
     return re.sub(r"\s+", " ", text.strip().lower())
 
-def semantic_paragraph_match(jd_text: str, cv_texts: list, model, top_k: int = 3) -> dict:
+def _cleaned(texts: list) -> list:
+    return [clean_text(txt) for txt in texts if isinstance(txt, str) and txt.strip()]
+
+def semantic_paragraph_match(jd_text: str, cv_texts: list, model, top_k: int = 3, embeddings=None) -> dict:
     jd_text = clean_text(jd_text)
-    cv_texts = [clean_text(txt) for txt in cv_texts if isinstance(txt, str) and txt.strip()]
+    cv_texts = _cleaned(cv_texts)
 
     if not jd_text or not cv_texts:
         return {"score": 0.0, "top_matches": []}
 
-    jd_emb = model.encode(jd_text, convert_to_tensor=True)
-    cv_embs = model.encode(cv_texts, convert_to_tensor=True)
+    embeddings = _ensure_encoded([jd_text] + cv_texts, embeddings, model)
+    sims = _lookup_sims(jd_text, cv_texts, embeddings).tolist()
+    return _paragraph_match_result(cv_texts, sims, top_k)
 
-    sims = cos_sim(jd_emb, cv_embs)[0].cpu().tolist()
+def _paragraph_match_result(cv_texts: list, sims: list, top_k: int) -> dict:
     top_matches = sorted(zip(cv_texts, sims), key=lambda x: x[1], reverse=True)[:min(top_k, len(sims))]
     avg_score = round(sum(score for _, score in top_matches) / len(top_matches), 3)
 
@@ -186,23 +252,106 @@ def semantic_paragraph_match(jd_text: str, cv_texts: list, model, top_k: int = 3
         "top_matches": [{"cv_text": txt[:120], "score": round(score, 3)} for txt, score in top_matches]
     }
 
-def evaluate_subjective_fit(jd_sections: dict, parsed_cv: dict, model) -> dict:
+# Components of the semantic score and their weights
+SEMANTIC_WEIGHTS = {
+    "job_role_fit": 0.4,
+    "responsibility_alignment": 0.3,
+    "values_match": 0.3
+}
+
+def subjective_cv_texts(parsed_cv: dict) -> dict:
     projects = [p.get("summary", "") for p in parsed_cv.get("projects", [])]
     extracurriculars = parsed_cv.get("extracurriculars", [])
     positions = parsed_cv.get("positions", [])
     achievements = parsed_cv.get("achievements", [])
+    return {
+        "job_role_fit": projects,
+        "responsibility_alignment": projects + positions + extracurriculars,
+        "values_match": achievements + extracurriculars + positions
+    }
+
+def subjective_jd_texts(jd_sections: dict) -> dict:
+    return {
+        "job_role_fit": jd_sections.get("job_role", ""),
+        "responsibility_alignment": " ".join(jd_sections.get("responsibilities", [])),
+        "values_match": " ".join(jd_sections.get("values", []))
+    }
+
+def scoring_texts(jd_structured: dict, jd_sections: dict, parsed_cv: dict) -> list:
+    """Every text SBERT sees when scoring one CV/JD pair, as the scorers will look them up"""
+    texts = [course_jd_text(jd_structured, jd_sections)]
+    texts += flatten_cv_courses(parsed_cv.get("courses") or {})
+    texts += [clean_text(txt) for txt in subjective_jd_texts(jd_sections).values()]
+    for cv_texts in subjective_cv_texts(parsed_cv).values():
+        texts += _cleaned(cv_texts)
+    return [txt for txt in texts if txt]
+
+def evaluate_subjective_fit(jd_sections: dict, parsed_cv: dict, model, embeddings=None) -> dict:
+    jd_texts = subjective_jd_texts(jd_sections)
+    cv_texts = subjective_cv_texts(parsed_cv)
+
+    # positions/extracurriculars feed several components; encode every distinct text once
+    if embeddings is None:
+        needed = [clean_text(txt) for txt in jd_texts.values()]
+        for texts in cv_texts.values():
+            needed += _cleaned(texts)
+        embeddings = encode_texts([txt for txt in needed if txt], model)
 
     return {
-        "job_role_fit": semantic_paragraph_match(jd_sections.get("job_role", ""), projects, model),
-        "responsibility_alignment": semantic_paragraph_match(" ".join(jd_sections.get("responsibilities", [])), projects + positions + extracurriculars, model),
-        "values_match": semantic_paragraph_match(" ".join(jd_sections.get("values", [])), achievements + extracurriculars + positions, model)
+        component: semantic_paragraph_match(jd_texts[component], cv_texts[component], model, embeddings=embeddings)
+        for component in SEMANTIC_WEIGHTS
     }
 
 def flatten_cv_skills(cv_skills_dict):
     return [skill.lower() for sublist in cv_skills_dict.values() for skill in sublist if isinstance(skill, str)]
 
 
-def evaluate_cv(jd_structured, jd_sections, parsed_resume, skill2vec_model, sbert_model, skill_weight=0.7):
+def jd_side_features(jd_structured: dict, jd_sections: dict, skill2vec_model, sbert_model) -> dict:
+    """Everything the scorer needs from the JD alone; identical for every candidate of a job"""
+    texts = [course_jd_text(jd_structured, jd_sections)]
+    texts += [clean_text(txt) for txt in subjective_jd_texts(jd_sections).values()]
+    index, matrix = encode_texts([txt for txt in texts if txt], sbert_model)
+    return {
+        "text_vectors": {txt: matrix[i] for txt, i in index.items()},
+        "required_vec": np.asarray(get_avg_vector(jd_structured.get("technologies", []), skill2vec_model), dtype=np.float32),
+        "preferred_vec": np.asarray(get_avg_vector(jd_sections.get("required_skills", []), skill2vec_model), dtype=np.float32)
+    }
+
+def _attach_scores(result, course_score, skill_category_score_result, skill_score_result, semantic_components, skill_weight):
+    skill_avg_score = {
+    "required_score": round(0.2 * skill_category_score_result["required_score"] + 0.8 * skill_score_result["required_score"], 3),
+    "preferred_score": round(0.2 * skill_category_score_result["preferred_score"] + 0.8 * skill_score_result["preferred_score"], 3),
+    "final_score": round(0.2 * skill_category_score_result["final_score"] + 0.8 * skill_score_result["final_score"], 3)
+    }
+
+    semantic_score = round(
+        0.4 * semantic_components["job_role_fit"]["score"] +
+        0.3 * semantic_components["responsibility_alignment"]["score"] +
+        0.3 * semantic_components["values_match"]["score"], 3
+    )
+
+    # Step 4: Final Score
+    final_score = round(skill_weight * skill_score_result["final_score"] + (1 - skill_weight) * semantic_score, 3)
+
+    # Attach all scores
+    result["course_score"] = course_score["score"]
+    result["skill_score"] = skill_avg_score
+    result["semantic_score"] = semantic_score
+    result["semantic_components"] = semantic_components
+    result["final_score"] = final_score
+    return result
+
+def _ineligible_result(reason):
+    return {
+        "eligible": False,
+        "eligibility_reason": reason,
+        "final_score": 0.0,
+        "skill_score": {},
+        "semantic_score": 0.0,
+        "semantic_components": {}
+    }
+
+def evaluate_cv(jd_structured, jd_sections, parsed_resume, skill2vec_model, sbert_model, skill_weight=0.7, jd_features=None):
     result = {}
 
     # Step 1: Eligibility Check
@@ -217,14 +366,24 @@ def evaluate_cv(jd_structured, jd_sections, parsed_resume, skill2vec_model, sber
         result["semantic_components"] = {}
         return result
 
-    course_score = course_match_score(jd_structured, jd_sections, parsed_resume["courses"],sbert_model)
+    # One SBERT batch for every text of this CV/JD pair, shared by the course and semantic scorers
+    # JD texts already in jd_features are not re-encoded
+    jd_features = jd_features or {}
+    embeddings = encode_texts(
+        scoring_texts(jd_structured, jd_sections, parsed_resume), sbert_model,
+        known=jd_features.get("text_vectors")
+    )
+
+    course_score = course_match_score(jd_structured, jd_sections, parsed_resume["courses"], sbert_model, embeddings=embeddings)
 
     # Step 2: Skill Score
     skill_category_score_result = score_cv_against_jd(
         cv_skills=parsed_resume.get("skills", []),
         required_techs=jd_structured.get("technologies", []),
         preferred_techs=jd_sections.get("required_skills", []),
-        model=skill2vec_model
+        model=skill2vec_model,
+        required_vec=jd_features.get("required_vec"),
+        preferred_vec=jd_features.get("preferred_vec")
     )
     flatten_techstacks = flatten_cv_skills(parsed_resume.get("skills", []))
 
@@ -232,32 +391,67 @@ def evaluate_cv(jd_structured, jd_sections, parsed_resume, skill2vec_model, sber
         cv_skills=flatten_techstacks,
         required_techs=jd_structured.get("technologies", []),
         preferred_techs=jd_sections.get("required_skills", []),
-        model=skill2vec_model
+        model=skill2vec_model,
+        required_vec=jd_features.get("required_vec"),
+        preferred_vec=jd_features.get("preferred_vec")
     )
 
-    skill_avg_score = {
-    "required_score": round(0.2 * skill_category_score_result["required_score"] + 0.8 * skill_score_result["required_score"], 3),
-    "preferred_score": round(0.2 * skill_category_score_result["preferred_score"] + 0.8 * skill_score_result["preferred_score"], 3),
-    "final_score": round(0.2 * skill_category_score_result["final_score"] + 0.8 * skill_score_result["final_score"], 3)
-    }
-
     # Step 3: Semantic Score
-    semantic_components = evaluate_subjective_fit(jd_sections, parsed_resume, sbert_model)
-    semantic_score = round(
-        0.4 * semantic_components["job_role_fit"]["score"] +
-        0.3 * semantic_components["responsibility_alignment"]["score"] +
-        0.3 * semantic_components["values_match"]["score"], 3
-    )
-
-    # Step 4: Final Score
-    final_score = round(skill_weight * skill_score_result["final_score"] + (1 - skill_weight) * semantic_score, 3)
-
-    # Attach all scores
-    result["course_score"] = course_score["score"]
-    result["skill_score"] = skill_avg_score
-    result["semantic_score"] = semantic_score
-    result["semantic_components"] = semantic_components
-    result["final_score"] = final_score
-
-    return result
-
+    semantic_components = evaluate_subjective_fit(jd_sections, parsed_resume, sbert_model, embeddings=embeddings)
+
+    return _attach_scores(result, course_score, skill_category_score_result, skill_score_result, semantic_components, skill_weight)
+
+
+# ---------------- Batched scoring: one JD against many CVs ----------------
+
+def evaluate_cvs_batch(jd_structured, jd_sections, parsed_resumes: list, skill2vec_model, sbert_model, skill_weight=0.7, batch_size: int = 64, jd_features=None) -> list:
+    """Score many parsed CVs against one JD; returns one evaluate_cv-style dict per CV, in order"""
+    results = [None] * len(parsed_resumes)
+    eligible = []
+    for i, parsed_resume in enumerate(parsed_resumes):
+        is_eligible, reason = check_eligibility(jd_structured, parsed_resume)
+        if is_eligible:
+            eligible.append(i)
+            results[i] = {"eligible": True, "eligibility_reason": reason}
+        else:
+            results[i] = _ineligible_result(reason)
+
+    if not eligible:
+        return results
+
+    # JD side: stored features when the caller has them, otherwise computed once for the batch
+    if jd_features is None:
+        jd_features = jd_side_features(jd_structured, jd_sections, skill2vec_model, sbert_model)
+
+    # Every text of every candidate goes through SBERT in one padded batch
+    all_texts = []
+    for i in eligible:
+        all_texts += scoring_texts(jd_structured, jd_sections, parsed_resumes[i])
+    embeddings = encode_texts(all_texts, sbert_model, batch_size=batch_size, known=jd_features["text_vectors"])
+
+    # ---- Skill side: each distinct skill is looked up once ----
+    vec_cache = {}
+    jd_skill_vecs = _unit_rows(np.vstack([jd_features["required_vec"], jd_features["preferred_vec"]]).astype(np.float32))
+    cv_skill_vecs = []
+    for i in eligible:
+        skills = parsed_resumes[i].get("skills", [])
+        cv_skill_vecs.append(get_avg_vector(skills, skill2vec_model, vec_cache))
+        cv_skill_vecs.append(get_avg_vector(flatten_cv_skills(skills), skill2vec_model, vec_cache))
+    skill_sims = _unit_rows(np.vstack(cv_skill_vecs).astype(np.float32)) @ jd_skill_vecs.T
+
+    for n, i in enumerate(eligible):
+        parsed_resume = parsed_resumes[i]
+        course_score = course_match_score(jd_structured, jd_sections, parsed_resume.get("courses") or {}, sbert_model, embeddings=embeddings)
+        semantic_components = evaluate_subjective_fit(jd_sections, parsed_resume, sbert_model, embeddings=embeddings)
+
+        category_row, flat_row = skill_sims[2 * n], skill_sims[2 * n + 1]
+        _attach_scores(
+            results[i],
+            course_score,
+            _skill_score_result(category_row[0], category_row[1]),
+            _skill_score_result(flat_row[0], flat_row[1]),
+            semantic_components,
+            skill_weight
+        )
+
+    return results
@@ -0,0 +1,97 @@
+import threading
+import numpy as np
+
+NGRAM = 3
+
+
+class SkillVocabIndex:
+    """Lookup structure over a Skill2Vec vocabulary for matching JD words against skills.
+
+    A JD word and a vocabulary skill are candidates when either is a substring of the
+    other. Skills contained in a word are found by probing the word's substrings in a
+    hash map; words contained in a skill are found through a character n-gram index.
+    Unit vectors of the vocabulary are cached, so each candidate costs one dot product.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.vocab = list(model.wv.index_to_key)
+        self.term_ids = {term: i for i, term in enumerate(self.vocab)}
+        self.max_term_len = max((len(term) for term in self.vocab), default=0)
+
+        # n-gram -> ids of skills containing it (words of >= NGRAM chars)
+        self.ngram_index = {}
+        # every substring shorter than NGRAM -> ids of skills containing it
+        self.short_index = {}
+        for i, term in enumerate(self.vocab):
+            for gram in {term[j:j + NGRAM] for j in range(len(term) - NGRAM + 1)}:
+                self.ngram_index.setdefault(gram, set()).add(i)
+            for size in range(1, NGRAM):
+                for sub in {term[j:j + size] for j in range(len(term) - size + 1)}:
+                    self.short_index.setdefault(sub, set()).add(i)
+
+        vectors = np.vstack([model.wv.get_vector(term) for term in self.vocab]) if self.vocab \
+            else np.zeros((0, model.vector_size), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.unit_vectors = (vectors / np.where(norms == 0, 1.0, norms)).astype(np.float32)
+
+    def _terms_inside(self, word: str) -> set:
+        # Vocabulary skills that are substrings of `word`
+        found = set()
+        n = len(word)
+        for start in range(n):
+            for end in range(start + 1, min(n, start + self.max_term_len) + 1):
+                term_id = self.term_ids.get(word[start:end])
+                if term_id is not None:
+                    found.add(term_id)
+        return found
+
+    def _terms_containing(self, word: str) -> set:
+        # Vocabulary skills that contain `word` as a substring
+        if len(word) < NGRAM:
+            return set(self.short_index.get(word, ()))
+        postings = []
+        for gram in {word[j:j + NGRAM] for j in range(len(word) - NGRAM + 1)}:
+            ids = self.ngram_index.get(gram)
+            if not ids:
+                return set()
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = set.intersection(*postings)
+        return {i for i in candidates if word in self.vocab[i]}
+
+    def candidates(self, word: str) -> set:
+        return self._terms_inside(word) | self._terms_containing(word)
+
+    def match(self, words, threshold: float = 0.8) -> list:
+        """Vocabulary skills with a substring-related word whose cosine similarity is >= threshold"""
+        matched = set()
+        for word in set(words):
+            term_ids = self.candidates(word) - matched
+            if not term_ids or word not in self.model.wv:
+                continue
+            vec = self.model.wv.get_vector(word)
+            vec_norm = np.linalg.norm(vec)
+            if vec_norm == 0:
+                continue
+            ids = list(term_ids)
+            sims = self.unit_vectors[ids] @ (vec / vec_norm)
+            matched.update(i for i, sim in zip(ids, sims) if sim >= threshold)
+        return sorted(self.vocab[i] for i in matched)
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_skill_index(model) -> SkillVocabIndex:
+    """Index for `model`, built once per model instance"""
+    index = _indexes.get(id(model))
+    if index is not None and index.model is model:
+        return index
+    with _indexes_lock:
+        index = _indexes.get(id(model))
+        if index is None or index.model is not model:
+            index = SkillVocabIndex(model)
+            _indexes[id(model)] = index
+        return index
@@ -1,17 +1,15 @@
 #backend/routes/students.py
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query, BackgroundTasks
 from models import StudentRegistration, StudentProfile, CVUpload, BaseModel, EmailStr
 from database import students_collection, applications_collection, parsed_cv_collection
 from utils.cloudinary_upload import upload_cv
 from bson import ObjectId
-from typing import List
+from typing import List, Optional
 import datetime
 
-from .parsed_cv import parse_cv
+from .cv_pipeline import parse_cvs_bulk, get_bulk_parse_progress, bulk_parse_running, parse_uploaded_cv
 from database import db
 from models import JobApplication
-import os
-import requests
 import re
 from models import ParsedCV
 from bson import json_util
@@ -24,7 +22,7 @@ router = APIRouter()
 async def register_student(student: StudentRegistration):
     """Register a new student"""
     # Check if student already exists
-    existing_student = students_collection.find_one({"email": student.email})
+    existing_student = await students_collection.find_one({"email": student.email})
     if existing_student:
         raise HTTPException(status_code=400, detail="Student with this email already exists")
     
@@ -32,7 +30,7 @@ async def register_student(student: StudentRegistration):
     student_data["cv_count"] = 0
     student_data["cvs"] = []
     
-    result = students_collection.insert_one(student_data)
+    result = await students_collection.insert_one(student_data)
     return {"message": "Student registered successfully", "student_id": str(result.inserted_id)}
 
 class StudentLogin(BaseModel):
@@ -41,7 +39,7 @@ class StudentLogin(BaseModel):
 
 @router.post("/login")
 async def login_recruiter(data: StudentLogin):
-    student = students_collection.find_one({"email": data.email, "password": data.password})
+    student = await students_collection.find_one({"email": data.email, "password": data.password})
     if not student:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     return {"message": "Login successful", "email": student["email"]}
@@ -49,7 +47,7 @@ async def login_recruiter(data: StudentLogin):
 @router.get("/profile/{email}")
 async def get_student_profile(email: str):
     """Fetch student profile by email"""
-    student = students_collection.find_one({"email": email})
+    student = await students_collection.find_one({"email": email})
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     
@@ -60,12 +58,13 @@ async def get_student_profile(email: str):
 @router.post("/upload-cv/{email}")
 async def upload_student_cv(
     email: str,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     cv_name: str = Form(...)
 ):
     """Upload CV for a student (max 3 CVs)"""
     # Check if student exists
-    student = students_collection.find_one({"email": email})
+    student = await students_collection.find_one({"email": email})
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     
@@ -78,29 +77,36 @@ async def upload_student_cv(
         raise HTTPException(status_code=400, detail="Only PDF and DOCX files are allowed")
     
     try:
-        # Upload to Cloudinary
+        # Keep the received bytes for parsing, then upload to Cloudinary
+        data = await file.read()
+        await file.seek(0)
         cv_url = upload_cv(file)
         
         # Create CV record
         cv_data = {
             "_id": ObjectId(),
             "cv_name": cv_name,
-            "cv_url": cv_url
+            "cv_url": cv_url,
+            "parse_status": "pending"
         }
         
         # Update student record
-        students_collection.update_one(
+        await students_collection.update_one(
             {"email": email},
             {
                 "$push": {"cvs": cv_data},
                 "$inc": {"cv_count": 1}
             }
         )
+
+        # Parse in the background from the uploaded bytes; no re-download later
+        background_tasks.add_task(parse_uploaded_cv, email, cv_data["_id"], cv_url, data)
         
         return {
             "message": "CV uploaded successfully",
             "cv_id": str(cv_data["_id"]),
-            "cv_url": cv_url
+            "cv_url": cv_url,
+            "parse_status": "pending"
         }
     
     except Exception as e:
@@ -109,7 +115,7 @@ async def upload_student_cv(
 @router.get("/cvs/{email}")
 async def get_student_cvs(email: str):
     """Get all CVs for a student"""
-    student = students_collection.find_one({"email": email})
+    student = await students_collection.find_one({"email": email})
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     
@@ -122,7 +128,7 @@ async def get_student_cvs(email: str):
 @router.delete("/cvs/{email}/{cv_id}")
 async def delete_student_cv(email: str, cv_id: str):
     """Delete a specific CV"""
-    result = students_collection.update_one(
+    result = await students_collection.update_one(
         {"email": email},
         {
             "$pull": {"cvs": {"_id": ObjectId(cv_id)}},
@@ -138,71 +144,40 @@ async def delete_student_cv(email: str, cv_id: str):
 @router.get("/applications/{email}")
 async def get_student_applications(email: str):
     """Get all job applications for a student"""
-    applications = list(applications_collection.find({"student_email": email}))
+    applications = await applications_collection.find({"student_email": email}).to_list(None)
     for app in applications:
         app["_id"] = str(app["_id"])
     
     return {"applications": applications}
 
-def download_cv(cv_url: str, save_path: str):
-    response = requests.get(cv_url)
-    with open(save_path, "wb") as f:
-        f.write(response.content)
-
-
 @router.post("/parse-all-cvs/")
-async def parse_all_uploaded_cvs():
-    parsed_results = []
-
-    # Make sure the temp folder exists
-    os.makedirs("temp_cvs", exist_ok=True)
-
-    # Fetch all students with at least one CV
-    students = list(students_collection.find({"cv_count": {"$gt": 0}}))
-    #print(students)
-
-    for student in students:
-        email = student["email"]
-        for cv in student.get("cvs", []):
-            try:
-                filename = f"{email.replace('@', '_at_')}_{str(cv['_id'])}.pdf"
-                save_path = os.path.join("temp_cvs", filename)
-
-                # Download the file
-                download_cv(cv["cv_url"], save_path)
-
-                # Parse it
-                parsed = parse_cv(save_path)
-
-                # Cleanup
-                os.remove(save_path)
-
-                # Update inside embedded array — tricky but doable
-                parsed_doc = {
-                    "_id": ObjectId(),  # optional, Mongo will auto-generate if omitted
-                    "student_email": email,
-                    "cv_id": cv["_id"],
-                    "parsed": parsed
-                }
-
-                parsed_cv_collection.insert_one(parsed_doc)
-
-                parsed_results.append({
-                    "student_email": email,
-                    "cv_id": str(cv["_id"]),
-                    "parsed": parsed
-                })
-
-            except Exception as e:
-                parsed_results.append({
-                    "student_email": email,
-                    "cv_id": str(cv.get("_id", "unknown")),
-                    "error": str(e)
-                })
-
+async def parse_all_uploaded_cvs(
+    download_concurrency: Optional[int] = None,
+    parse_workers: Optional[int] = None,
+    write_batch_size: Optional[int] = None,
+    force: bool = False
+):
+    """Parse new or changed CVs: concurrent downloads, process-pool parsing, batched upserts.
+
+    parse_workers bounds the CVs held downloaded-but-unparsed; it does not resize the parse pool.
+    """
+    if bulk_parse_running():
+        raise HTTPException(status_code=409, detail="A bulk CV parse is already running")
+    parsed_results = await parse_cvs_bulk(
+        download_concurrency=download_concurrency,
+        parse_workers=parse_workers,
+        write_batch_size=write_batch_size,
+        force=force,
+        track_progress=True
+    )
     return {"total": len(parsed_results), "results": parsed_results}
 
+@router.get("/parse-all-cvs/progress")
+async def parse_all_cvs_progress():
+    """Progress of the current or most recent bulk CV parse"""
+    return get_bulk_parse_progress()
+
 async def get_all_parsed_cvs(student_email: str = Query(None)):
     query = {"student_email": student_email} if student_email else {}
-    cvs = list(parsed_cv_collection.find(query, {"_id": 0}))
+    cvs = await parsed_cv_collection.find(query, {"_id": 0}).to_list(None)
     return {"total": len(cvs), "data": cvs}
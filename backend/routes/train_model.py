@@ -1,28 +1,72 @@
-import pandas as pd
+# Offline build step for the Skill2Vec model.
+#
+# Run once (from backend/) whenever the dataset changes:
+#     python -m routes.train_model
+#
+# The full FastText model (including subword n-gram buckets, so OOV skills still
+# get vectors) is saved with every large array in its own .npy file. The server
+# then loads it with mmap="r", so workers start quickly and share the pages.
+import os
 from gensim.models import FastText
 
-# Step 1: Load the dataset
-df = pd.read_csv("../Skill2Vec_Dataset__Padded_.csv", header=None, engine="python")
-
-# Step 2: Drop the first two columns (job_role and skill_field) → retain only skills
-skill_data = df.iloc[:, 2:]
-
-# Step 3: Convert to list of tokenized skill rows, removing NaN/blanks
-sentences = [
-    [str(s).strip().lower() for s in row if isinstance(s, str) and s.strip()]
-    for row in skill_data.values.tolist()
-]
-
-# Step 4: Train the FastText model
-model = FastText(
-    sentences,
-    vector_size=100,
-    window=5,
-    min_count=1,
-    sg=1,
-    epochs=30,
-    workers=4
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_PATH = os.getenv(
+    "SKILL2VEC_DATASET_PATH",
+    os.path.join(os.path.dirname(BACKEND_DIR), "Skill2Vec_Dataset__Padded_.csv")
 )
+MODEL_PATH = os.getenv(
+    "SKILL2VEC_MODEL_PATH",
+    os.path.join(BACKEND_DIR, "artifacts", "skill2vec.model")
+)
+
+
+def load_skill_sentences(dataset_path: str = DATASET_PATH) -> list:
+    import pandas as pd
+
+    # Step 1: Load the dataset
+    df = pd.read_csv(dataset_path, header=None, engine="python")
+
+    # Step 2: Drop the first two columns (job_role and skill_field) → retain only skills
+    skill_data = df.iloc[:, 2:]
+
+    # Step 3: Convert to list of tokenized skill rows, removing NaN/blanks
+    return [
+        [str(s).strip().lower() for s in row if isinstance(s, str) and s.strip()]
+        for row in skill_data.values.tolist()
+    ]
+
+
+def train_skill2vec(sentences: list) -> FastText:
+    # Step 4: Train the FastText model
+    return FastText(
+        sentences,
+        vector_size=100,
+        window=5,
+        min_count=1,
+        sg=1,
+        epochs=30,
+        workers=4
+    )
+
+
+def build_skill2vec_model(dataset_path: str = DATASET_PATH, model_path: str = MODEL_PATH) -> FastText:
+    model = train_skill2vec(load_skill_sentences(dataset_path))
+
+    # Step 5: Save the full model; sep_limit=0 stores every numpy array separately so it can be mmapped
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+    model.save(model_path, sep_limit=0)
+    return model
+
+
+def load_skill2vec_model(model_path: str = MODEL_PATH) -> FastText:
+    """Load the prebuilt Skill2Vec model read-only through mmap"""
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(
+            f"Skill2Vec model not found at {model_path}. Build it first with: python -m routes.train_model"
+        )
+    return FastText.load(model_path, mmap="r")
+
 
-# Step 5: Save the trained vectors
-model.wv.save_word2vec_format("trained_skill2vec.txt", binary=False)
+if __name__ == "__main__":
+    built = build_skill2vec_model()
+    print(f"Saved Skill2Vec model ({len(built.wv.index_to_key)} skills) to {MODEL_PATH}")
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from utils.llm_backend import LocalStubLLM, stub_completion
+from utils.llm_feedback import parse_llm_feedback
+
+BATCHED_PROMPT = (
+    "Respond with one section per candidate:\n<<Candidate: ID>>\n...\n\n"
+    "Candidates:\n<<Candidate: C1>>\nSkills: python, sql\n\n<<Candidate: C2>>\nSkills: java"
+)
+
+
+def test_single_reply_round_trips_through_the_parser():
+    reply = stub_completion("Resume Overview: python")
+    assert reply == stub_completion("Resume Overview: python")
+    feedback = parse_llm_feedback(reply)
+    assert 10 <= feedback["score"] <= 98
+    assert feedback["strengths"] and feedback["weaknesses"]
+    assert "fit" in feedback["recommendation"]
+
+
+def test_batched_reply_round_trips_through_the_parser():
+    sections = parse_llm_feedback(stub_completion(BATCHED_PROMPT), ["C1", "C2", "C3"])
+    assert set(sections) == {"C1", "C2", "C3"}
+    # The template's "ID" placeholder is not a candidate
+    assert sections["C3"] is None
+    for candidate_id in ("C1", "C2"):
+        assert 10 <= sections[candidate_id]["score"] <= 98
+
+
+def test_candidate_scores_do_not_depend_on_the_batch():
+    alone = parse_llm_feedback(
+        stub_completion("Candidates:\n<<Candidate: C1>>\nSkills: python, sql\n\n"), ["C1"]
+    )
+    together = parse_llm_feedback(stub_completion(BATCHED_PROMPT), ["C1"])
+    assert alone["C1"]["score"] == together["C1"]["score"]
+
+
+def test_stub_latency_and_error_rate():
+    always_fails = LocalStubLLM(latency_ms=0, jitter_ms=0, error_rate=1.0)
+    with pytest.raises(Exception):
+        asyncio.run(always_fails.acomplete("prompt"))
+    assert always_fails.stats == {"calls": 1, "errors": 1}
+
+    slow = LocalStubLLM(latency_ms=30, jitter_ms=0, error_rate=0.0)
+
+    async def timed():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await slow.acomplete("prompt")
+        return loop.time() - start
+
+    assert asyncio.run(timed()) >= 0.025
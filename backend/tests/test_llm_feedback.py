@@ -0,0 +1,37 @@
+from utils.llm_feedback import parse_llm_feedback
+
+SINGLE = """<<Score:>>
+72
+
+<<Strengths:>>
+- Strong Python
+- Shipped REST APIs
+
+<<Weaknesses:>>
+- No cloud experience
+
+<<Final Recommendation:>>
+Moderate fit — solid backend basics
+"""
+
+
+def test_parses_single_candidate_reply():
+    feedback = parse_llm_feedback(SINGLE)
+    assert feedback["score"] == 72
+    assert feedback["strengths"] == ["Strong Python", "Shipped REST APIs"]
+    assert feedback["weaknesses"] == ["No cloud experience"]
+    assert "Moderate fit" in feedback["recommendation"]
+
+
+def test_parses_batched_reply_per_candidate():
+    reply = (
+        "<<Candidate: C1>>\n" + SINGLE
+        + "\n<<Candidate: C2>>\n<<Score:>> unreadable\n"
+        + "\n<<Candidate: C10>>\n" + SINGLE.replace("72", "55")
+    )
+    sections = parse_llm_feedback(reply, ["C1", "C2", "C10", "C3"])
+    assert sections["C1"]["score"] == 72
+    # C1 must not pick up C10's section
+    assert sections["C10"]["score"] == 55
+    assert sections["C2"] is None
+    assert sections["C3"] is None
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from utils.llm_limiter import LLMLimiter
+
+
+class _Runnable:
+    """Fails with the given errors, in order, then answers with its value after `delay`"""
+
+    def __init__(self, value, delay=0.0, errors=()):
+        self.value = value
+        self.delay = delay
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def ainvoke(self, inputs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.value
+
+
+class _RateLimited(Exception):
+    code = 429
+
+
+def _limiter(max_retries=3):
+    return LLMLimiter(concurrency=2, requests_per_minute=60000, burst=10, timeout_s=5,
+                      max_retries=max_retries, backoff_base_s=0.001, backoff_max_s=0.005)
+
+
+def test_keeps_result_order():
+    limiter = _limiter()
+    runnables = [_Runnable(i, delay=0.02 * (5 - i)) for i in range(5)]
+
+    async def run():
+        return await asyncio.gather(*(limiter.invoke(r, {}) for r in runnables))
+
+    assert asyncio.run(run()) == [0, 1, 2, 3, 4]
+    assert limiter.stats["calls"] == 5
+
+
+def test_retries_then_gives_up():
+    limiter = _limiter(max_retries=3)
+
+    flaky = _Runnable("ok", errors=[_RateLimited(), _RateLimited()])
+    assert asyncio.run(limiter.invoke(flaky, {})) == "ok"
+    assert flaky.calls == 3
+    assert limiter.stats["retries"] == 2
+
+    exhausted = _Runnable("ok", errors=[_RateLimited()] * 4)
+    with pytest.raises(_RateLimited):
+        asyncio.run(limiter.invoke(exhausted, {}))
+    assert exhausted.calls == 4
+
+    assert limiter.stats["retries"] == 5
+    assert limiter.stats["failures"] == 1
+
+
+def test_timeout_counts_and_raises():
+    limiter = LLMLimiter(concurrency=1, requests_per_minute=60000, burst=1, timeout_s=0.01,
+                         max_retries=0, backoff_base_s=0.001, backoff_max_s=0.001)
+    with pytest.raises(TimeoutError):
+        asyncio.run(limiter.invoke(_Runnable("late", delay=0.5), {}))
+    assert limiter.stats["timeouts"] == 1
+    assert limiter.stats["failures"] == 1
+
+
+class _InvalidArgument(Exception):
+    code = 400
+
+
+def test_permanent_errors_are_not_retried():
+    limiter = _limiter(max_retries=3)
+    rejected = _Runnable("ok", errors=[_InvalidArgument()])
+    with pytest.raises(_InvalidArgument):
+        asyncio.run(limiter.invoke(rejected, {}))
+    assert rejected.calls == 1
+    assert limiter.stats["retries"] == 0
+    assert limiter.stats["failures"] == 1
+    assert limiter.stats["permanent_errors"] == 1
+
+    safety_block = _Runnable("ok", errors=[ValueError("blocked")])
+    with pytest.raises(ValueError):
+        asyncio.run(limiter.invoke(safety_block, {}))
+    assert safety_block.calls == 1
+
+    disconnected = _Runnable("ok", errors=[ConnectionError()])
+    assert asyncio.run(limiter.invoke(disconnected, {})) == "ok"
+    assert disconnected.calls == 2
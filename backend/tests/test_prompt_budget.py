@@ -0,0 +1,53 @@
+from utils.prompt_budget import compact_sections, dedupe_chunks, estimate_tokens, fit_to_budget, prompt_size
+
+
+def test_estimate_tokens_counts_words_and_punctuation():
+    assert estimate_tokens("Python, SQL") == 3
+    assert estimate_tokens("") == 0
+
+
+def test_dedupe_chunks_drops_empty_and_near_duplicates():
+    chunks = [
+        "Built a REST API in Python",
+        "",
+        "built a  REST API in python",
+        "REST API in Python",
+        "Led the robotics club",
+    ]
+    assert dedupe_chunks(chunks) == ["Built a REST API in Python", "Led the robotics club"]
+    assert dedupe_chunks(["Led the robotics club"], seen=["Led the robotics club team"]) == []
+
+
+def test_fit_to_budget_keeps_leading_chunks_and_cuts_the_last():
+    chunks = ["one two three", "four five six seven"]
+    assert fit_to_budget(chunks, 100) == chunks
+    assert fit_to_budget(chunks, 3) == ["one two three"]
+    assert fit_to_budget(chunks, 5) == ["one two three", "four five ..."]
+    assert fit_to_budget(chunks, 0) == []
+
+
+def test_compact_sections_dedupes_later_sections_against_earlier_ones():
+    compacted = compact_sections(
+        {"cv_chunks": ["Built a REST API in Python"], "cv_text": ["Built a REST API in Python", "Dean's list"]},
+        {"cv_chunks": 100, "cv_text": 100}
+    )
+    assert compacted == {"cv_chunks": ["Built a REST API in Python"], "cv_text": ["Dean's list"]}
+
+
+def test_prompt_size_includes_template():
+    sizes = prompt_size({"jd_text": "a b", "cv_text": "c"}, template="Score {jd_text}")
+    assert sizes == {"jd_text": 2, "cv_text": 1, "total": 3 + 4}
+
+
+def test_fit_to_budget_keeps_original_text_when_cutting():
+    chunks = ["Python and SQL", "Built services in C++ and Node.js, e.g. a gateway"]
+    # 10 tokens of the second chunk fit: "Built services in C + + and Node . js"
+    assert fit_to_budget(chunks, 13) == ["Python and SQL", "Built services in C++ and Node.js ..."]
+
+
+def test_compact_sections_keeps_chunks_an_earlier_budget_dropped():
+    a, b, c = "alpha beta gamma", "delta epsilon zeta", "eta theta iota"
+    compacted = compact_sections({"cv_chunks": [a, b], "cv_text": [a, b, c]}, {"cv_chunks": 5, "cv_text": 100})
+    assert compacted["cv_chunks"] == [a, "delta epsilon ..."]
+    # B was cut short above, so the overview still carries it in full
+    assert compacted["cv_text"] == [b, c]
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+import utils.vector_store as vector_store
+from utils.vector_store import LocalVectorStore, matches_filter
+
+
+def _unit(i, dimension=8):
+    vector = np.zeros(dimension, dtype=np.float32)
+    vector[i] = 1.0
+    return vector
+
+
+def test_matches_filter_operators():
+    metadata = {"resume_id": "r1", "section": "projects"}
+    assert matches_filter(metadata, {"resume_id": "r1"})
+    assert matches_filter(metadata, {"resume_id": {"$in": ["r1", "r2"]}, "section": {"$ne": "skills"}})
+    assert not matches_filter(metadata, {"resume_id": {"$nin": ["r1"]}})
+    assert matches_filter(metadata, None)
+
+
+def test_upsert_query_delete_reload(tmp_path):
+    store = LocalVectorStore(str(tmp_path), dimension=8)
+    store.upsert([
+        ("r1-a", _unit(0), {"resume_id": "r1", "text": "python"}),
+        ("r1-b", _unit(1), {"resume_id": "r1", "text": "sql"}),
+        ("r2-a", _unit(0), {"resume_id": "r2", "text": "java"}),
+    ])
+    assert len(store) == 3
+
+    matches = store.query(_unit(0), top_k=5, filter={"resume_id": "r1"})
+    assert [m["id"] for m in matches] == ["r1-a", "r1-b"]
+    assert matches[0]["score"] == pytest.approx(1.0)
+    assert matches[0]["metadata"]["text"] == "python"
+
+    # Re-upserting an id replaces its vector and metadata
+    store.upsert([("r1-a", _unit(2), {"resume_id": "r1", "text": "pandas"})])
+    assert len(store) == 3
+    assert store.query(_unit(2), top_k=1)[0]["metadata"]["text"] == "pandas"
+
+    store.delete(ids=["r1-b"])
+    store.delete(filter={"resume_id": "r2"})
+    assert len(store) == 1
+
+    reloaded = LocalVectorStore(str(tmp_path), dimension=8)
+    assert len(reloaded) == 1
+    match = reloaded.query(_unit(2), top_k=1, filter={"resume_id": "r1"})[0]
+    assert (match["id"], match["metadata"]["text"]) == ("r1-a", "pandas")
+
+
+def test_instances_sharing_a_path_see_each_others_writes(tmp_path):
+    api = LocalVectorStore(str(tmp_path), dimension=8)
+    worker = LocalVectorStore(str(tmp_path), dimension=8)
+    api.upsert([("r1-a", _unit(0), {"resume_id": "r1"})])
+    worker.upsert([("r2-a", _unit(1), {"resume_id": "r2"})])
+    assert len(api) == 2
+    assert worker.query(_unit(0), top_k=1, filter={"resume_id": "r1"})[0]["id"] == "r1-a"
+    api.delete(ids=["r2-a"])
+    assert worker.query(_unit(1), top_k=5, filter={"resume_id": "r2"}) == []
+
+
+def test_compaction_keeps_live_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_store, "COMPACT_MIN_DEAD_ROWS", 5)
+    store = LocalVectorStore(str(tmp_path), dimension=8)
+    for i in range(20):
+        store.upsert([("same", _unit(i % 8), {"version": i})])
+    assert len(store) == 1
+    assert store._rows < 20
+    reloaded = LocalVectorStore(str(tmp_path), dimension=8)
+    assert reloaded.query(_unit(3), top_k=1)[0]["metadata"] == {"version": 19}
+
+
+def test_list_ids_by_prefix(tmp_path):
+    store = LocalVectorStore(str(tmp_path), dimension=8)
+    store.upsert([(f"r1-{i}", _unit(i), {"resume_id": "r1"}) for i in range(3)])
+    store.upsert([("r2-0", _unit(0), {"resume_id": "r2"})])
+    store.delete(ids=["r1-1"])
+    assert sorted(store.list_ids("r1-")) == ["r1-0", "r1-2"]
+    assert LocalVectorStore(str(tmp_path), dimension=8).list_ids("r2-") == ["r2-0"]
+
+
+def test_resume_scoped_query_scores_only_that_resumes_rows(tmp_path):
+    store = LocalVectorStore(str(tmp_path), dimension=8)
+    store.upsert([(f"r{r}-{i}", _unit(i), {"resume_id": f"r{r}"}) for r in range(20) for i in range(3)])
+    store.upsert([("r7-0", _unit(5), {"resume_id": "r7"})])  # replaced row leaves the index
+    store.delete(ids=["r7-2"])
+
+    assert sorted(store._candidate_rows({"resume_id": "r7"})) == sorted(
+        store._positions[id_] for id_ in ("r7-0", "r7-1")
+    )
+    assert len(store._candidate_rows({"resume_id": {"$in": ["r1", "r2"]}})) == 6
+    assert [m["id"] for m in store.query(_unit(5), top_k=1, filter={"resume_id": "r7"})] == ["r7-0"]
+    assert store.query(_unit(0), top_k=5, filter={"resume_id": "missing"}) == []
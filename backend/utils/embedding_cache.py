@@ -0,0 +1,142 @@
+#backend/utils/embedding_cache.py
+import hashlib
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.model_registry import registered_name
+
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "50000"))
+# "mongo" keeps vectors across restarts in the embedding_cache collection; "memory" is LRU only
+EMBEDDING_CACHE_BACKEND = os.getenv("EMBEDDING_CACHE_BACKEND", "mongo").lower()
+
+
+def normalize_text(text: str) -> str:
+    # Whitespace is not significant to the tokenizer, so collapse it before hashing
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(model_name: str, text: str) -> str:
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{model_name}:{digest}"
+
+
+class EmbeddingCache:
+    """Two-tier cache of float32 sentence embeddings keyed by (model name, normalized text hash)"""
+
+    def __init__(self, max_items: int = EMBEDDING_CACHE_SIZE, backend: str = EMBEDDING_CACHE_BACKEND):
+        self.max_items = max_items
+        self.backend = backend
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._collection = None
+        self.counters = {"memory_hits": 0, "persistent_hits": 0, "misses": 0, "persistent_errors": 0}
+
+    def _persistent(self):
+        if self.backend != "mongo":
+            return None
+        if self._collection is None:
+            from database import embedding_cache_collection
+            self._collection = embedding_cache_collection
+        return self._collection
+
+    def _remember(self, key, vector):
+        with self._lock:
+            self._lru[key] = vector
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_items:
+                self._lru.popitem(last=False)
+
+    def get_many(self, keys: list) -> dict:
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._lru.get(key)
+                if vector is not None:
+                    self._lru.move_to_end(key)
+                    found[key] = vector
+            self.counters["memory_hits"] += len(found)
+
+        missing = [k for k in keys if k not in found]
+        collection = self._persistent() if missing else None
+        if collection is not None:
+            try:
+                for doc in collection.find({"_id": {"$in": missing}}, {"vector": 1}):
+                    vector = np.frombuffer(doc["vector"], dtype=np.float32)
+                    found[doc["_id"]] = vector
+                    self._remember(doc["_id"], vector)
+                    self.counters["persistent_hits"] += 1
+            except Exception as e:
+                self.counters["persistent_errors"] += 1
+                print(f"⚠️ Embedding cache lookup failed: {e}")
+        return found
+
+    def put_many(self, model_name: str, items: dict):
+        for key, vector in items.items():
+            self._remember(key, vector)
+
+        collection = self._persistent()
+        if collection is None or not items:
+            return
+        from pymongo import UpdateOne
+        try:
+            collection.bulk_write([
+                UpdateOne(
+                    {"_id": key},
+                    {"$set": {"model": model_name, "dim": int(vector.shape[0]), "vector": vector.tobytes()}},
+                    upsert=True
+                )
+                for key, vector in items.items()
+            ], ordered=False)
+        except Exception as e:
+            self.counters["persistent_errors"] += 1
+            print(f"⚠️ Embedding cache write failed: {e}")
+
+    def encode(self, texts: list, model, model_name: str, batch_size: int = 64) -> np.ndarray:
+        """Embeddings for `texts` (rows in input order); only cache misses reach the model"""
+        keys = [cache_key(model_name, t) for t in texts]
+        found = self.get_many(list(dict.fromkeys(keys)))
+
+        to_encode = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in to_encode:
+                to_encode[key] = text
+        self.counters["misses"] += len(to_encode)
+
+        if to_encode:
+            fresh = np.asarray(
+                model.encode(list(to_encode.values()), batch_size=batch_size, convert_to_numpy=True),
+                dtype=np.float32
+            )
+            new_items = dict(zip(to_encode.keys(), fresh))
+            self.put_many(model_name, new_items)
+            found.update(new_items)
+
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack([found[k] for k in keys])
+
+    def stats(self) -> dict:
+        lookups = self.counters["memory_hits"] + self.counters["persistent_hits"] + self.counters["misses"]
+        hits = lookups - self.counters["misses"]
+        return {
+            **self.counters,
+            "backend": self.backend,
+            "size": len(self._lru),
+            "max_items": self.max_items,
+            "hit_rate": round(hits / lookups, 3) if lookups else None
+        }
+
+
+embedding_cache = EmbeddingCache()
+
+
+def cached_encode(texts: list, model, batch_size: int = 64) -> np.ndarray:
+    """Encode through the shared cache when `model` comes from the model registry"""
+    model_name = registered_name(model)
+    if model_name is None:
+        return np.asarray(model.encode(texts, batch_size=batch_size, convert_to_numpy=True), dtype=np.float32)
+    return embedding_cache.encode(texts, model, model_name, batch_size=batch_size)
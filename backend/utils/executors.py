@@ -0,0 +1,159 @@
+#backend/utils/executors.py
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", "4"))
+PARSE_PROCESSES = int(os.getenv("PARSE_PROCESSES", str(max(1, (os.cpu_count() or 2) - 1))))
+# Number of recent tasks the wait/run time percentiles are computed over
+EXECUTOR_METRICS_WINDOW = int(os.getenv("EXECUTOR_METRICS_WINDOW", "1000"))
+
+
+def _timed_call(fn, args, kwargs):
+    # Runs inside the worker (thread or process); wall-clock times are comparable across processes
+    started_at = time.time()
+    try:
+        result = fn(*args, **kwargs)
+    except Exception as e:
+        return started_at, time.time(), None, e
+    return started_at, time.time(), result, None
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class ManagedExecutor:
+    """Lazily created thread or process pool with queue-depth and wait-time metrics.
+
+    kind="thread" suits model inference (numpy / torch release the GIL);
+    kind="process" suits pure-Python parsing, and needs picklable, module-level callables.
+    """
+
+    def __init__(self, name: str, kind: str, max_workers: int):
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._finished = 0
+        self._failed = 0
+        self._waits_ms = deque(maxlen=EXECUTOR_METRICS_WINDOW)
+        self._runs_ms = deque(maxlen=EXECUTOR_METRICS_WINDOW)
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        # spawn: forking a process that holds model threads and Mongo sockets is unsafe
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                        )
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers, thread_name_prefix=self.name
+                        )
+        return self._executor
+
+    def _submit(self, fn, args, kwargs):
+        with self._lock:
+            self._submitted += 1
+        return self._get_executor().submit(_timed_call, fn, args, kwargs)
+
+    def _record(self, submitted_at, outcome):
+        started_at, finished_at, result, error = outcome
+        with self._lock:
+            self._finished += 1
+            if error is not None:
+                self._failed += 1
+            self._waits_ms.append((started_at - submitted_at) * 1000)
+            self._runs_ms.append((finished_at - started_at) * 1000)
+        if error is not None:
+            raise error
+        return result
+
+    async def run(self, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) on the pool without blocking the event loop"""
+        submitted_at = time.time()
+        future = self._submit(fn, args, kwargs)
+        try:
+            outcome = await asyncio.wrap_future(future)
+        except Exception:
+            # The pool itself failed (e.g. a worker process died)
+            with self._lock:
+                self._finished += 1
+                self._failed += 1
+            raise
+        return self._record(submitted_at, outcome)
+
+    def call(self, fn, *args, **kwargs):
+        """Blocking variant for code that already runs in a worker thread; never call it on the event loop"""
+        submitted_at = time.time()
+        future = self._submit(fn, args, kwargs)
+        try:
+            outcome = future.result()
+        except Exception:
+            with self._lock:
+                self._finished += 1
+                self._failed += 1
+            raise
+        return self._record(submitted_at, outcome)
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_flight = self._submitted - self._finished
+            waits = list(self._waits_ms)
+            runs = list(self._runs_ms)
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "started": self._executor is not None,
+                "submitted": self._submitted,
+                "finished": self._finished,
+                "failed": self._failed,
+                "in_flight": in_flight,
+                # Tasks beyond the worker count are waiting for a free worker
+                "queue_depth": max(0, in_flight - self.max_workers),
+                "wait_ms_p50": round(_percentile(waits, 0.5), 2),
+                "wait_ms_p99": round(_percentile(waits, 0.99), 2),
+                "run_ms_p50": round(_percentile(runs, 0.5), 2),
+                "run_ms_p99": round(_percentile(runs, 0.99), 2),
+            }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+inference_executor = ManagedExecutor("inference", "thread", INFERENCE_THREADS)
+parse_executor = ManagedExecutor("parse", "process", PARSE_PROCESSES)
+
+
+async def run_inference(fn, *args, **kwargs):
+    """Model inference / scoring (SBERT, Skill2Vec, evaluate_cv) on the inference thread pool"""
+    return await inference_executor.run(fn, *args, **kwargs)
+
+
+async def run_parse(fn, *args, **kwargs):
+    """CPU-bound pure-Python parsing (PDF text + regex extraction) on the parse process pool"""
+    return await parse_executor.run(fn, *args, **kwargs)
+
+
+def executor_stats() -> dict:
+    return {executor.name: executor.stats() for executor in (inference_executor, parse_executor)}
+
+
+def shutdown_executors():
+    inference_executor.shutdown()
+    parse_executor.shutdown()
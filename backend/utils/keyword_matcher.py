@@ -0,0 +1,86 @@
+#backend/utils/keyword_matcher.py
+from collections import deque
+from functools import lru_cache
+
+
+def _is_word_char(ch: str) -> bool:
+    # Same notion of a word character as regex \w
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a keyword list; one pass over the text finds every keyword.
+
+    Matching is case-insensitive. With word_boundary=True a hit only counts when it is not
+    glued to a word character on either side, i.e. the (?<!\\w)kw(?!\\w) rule used by the
+    parsers (identical to \\bkw\\b for keywords that start and end with a word character).
+    Overlapping keywords ("react" / "react native") are all reported.
+    """
+
+    def __init__(self, keywords, word_boundary: bool = True):
+        self.keywords = list(dict.fromkeys(kw.lower() for kw in keywords if kw))
+        self.word_boundary = word_boundary
+        self._order = {kw: i for i, kw in enumerate(self.keywords)}
+
+        # Trie: goto transitions, failure links and keyword ids ending at each state
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for kw_id, kw in enumerate(self.keywords):
+            state = 0
+            for ch in kw:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(kw_id)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_all(self, text: str) -> list:
+        """Distinct keywords present in `text`, in keyword-list order"""
+        text = text.lower()
+        goto, fail, out, keywords = self._goto, self._fail, self._out, self.keywords
+        n = len(text)
+        hits = set()
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            for kw_id in out[state]:
+                if kw_id in hits:
+                    continue
+                if self.word_boundary:
+                    start = pos - len(keywords[kw_id]) + 1
+                    if start > 0 and _is_word_char(text[start - 1]):
+                        continue
+                    if pos + 1 < n and _is_word_char(text[pos + 1]):
+                        continue
+                hits.add(kw_id)
+        return [keywords[i] for i in sorted(hits)]
+
+
+@lru_cache(maxsize=64)
+def _compiled(keywords: tuple, word_boundary: bool) -> KeywordMatcher:
+    return KeywordMatcher(keywords, word_boundary=word_boundary)
+
+
+def get_matcher(keywords, word_boundary: bool = True) -> KeywordMatcher:
+    """Shared matcher for a keyword list, compiled on first use"""
+    return _compiled(tuple(keywords), word_boundary)
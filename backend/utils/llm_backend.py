@@ -0,0 +1,95 @@
+#backend/utils/llm_backend.py
+import asyncio
+import hashlib
+import os
+import random
+import re
+
+# "gemini" calls Google Gemini; "stub" is a deterministic offline stand-in for load tests
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini").lower()
+LLM_STUB_LATENCY_MS = float(os.getenv("LLM_STUB_LATENCY_MS", "800"))
+LLM_STUB_JITTER_MS = float(os.getenv("LLM_STUB_JITTER_MS", "200"))
+# Fraction of stub calls that raise, to exercise retries and error handling
+LLM_STUB_ERROR_RATE = float(os.getenv("LLM_STUB_ERROR_RATE", "0"))
+LLM_STUB_SEED = int(os.getenv("LLM_STUB_SEED", "0"))
+
+STUB_MODEL = "local-stub"
+
+
+class StubServiceUnavailable(Exception):
+    """Simulated transient failure; retried by the LLM limiter like a real 503"""
+    code = 503
+
+
+_CANDIDATE_RE = re.compile(r"<<\s*Candidate:\s*(\w+)\s*>>")
+
+
+def _stub_feedback(seed_text: str) -> str:
+    """One <<Score:>> ... <<Final Recommendation:>> block; the same input always gives the same block"""
+    digest = hashlib.sha256(seed_text.encode("utf-8")).digest()
+    score = 10 + digest[0] % 89
+    fit = "Strong" if score >= 70 else "Moderate" if score >= 45 else "Weak"
+    return (
+        f"<<Score:>>\n{score}\n\n"
+        f"<<Strengths:>>\n- Relevant experience for the role (stub {digest[1]})\n- Skills overlap with the job description\n\n"
+        f"<<Weaknesses:>>\n- Some required skills not evidenced (stub {digest[2]})\n\n"
+        f"<<Final Recommendation:>>\n{fit} fit — generated by the local LLM stub"
+    )
+
+
+def stub_completion(prompt: str) -> str:
+    """Deterministic reply to a feedback prompt, with one section per candidate for batched prompts"""
+    # The batched template's own format example uses the placeholder id "ID"
+    candidate_ids = list(dict.fromkeys(c for c in _CANDIDATE_RE.findall(prompt) if c != "ID"))
+    if not candidate_ids:
+        return _stub_feedback(prompt)
+    sections = []
+    for candidate_id in candidate_ids:
+        # Seed on the candidate's own section so a candidate scores the same in any batch
+        match = re.search(
+            rf"<<\s*Candidate:\s*{re.escape(candidate_id)}\s*>>(.*?)(?=<<\s*Candidate:|\Z)", prompt, re.S
+        )
+        sections.append(f"<<Candidate: {candidate_id}>>\n\n" + _stub_feedback(match.group(1)))
+    return "\n\n".join(sections)
+
+
+class LocalStubLLM:
+    """Offline chat model: sleeps for the configured latency, fails at the configured rate,
+    otherwise answers in the feedback prompt's format"""
+
+    def __init__(self, latency_ms: float = LLM_STUB_LATENCY_MS, jitter_ms: float = LLM_STUB_JITTER_MS,
+                 error_rate: float = LLM_STUB_ERROR_RATE, seed: int = LLM_STUB_SEED):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self.stats = {"calls": 0, "errors": 0}
+
+    async def acomplete(self, prompt: str) -> str:
+        self.stats["calls"] += 1
+        delay_ms = max(0.0, self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms))
+        await asyncio.sleep(delay_ms / 1000)
+        if self._random.random() < self.error_rate:
+            self.stats["errors"] += 1
+            raise StubServiceUnavailable("Simulated LLM failure (local stub)")
+        return stub_completion(prompt)
+
+
+def get_chat_model(model: str, temperature: float, api_key: str = None):
+    """(model name, runnable chat model) for LLM_BACKEND, to be piped after a prompt template.
+
+    The stub reports its own model name so its completions never mix with Gemini's in the LLM cache.
+    """
+    if LLM_BACKEND == "stub":
+        from langchain_core.messages import AIMessage
+        from langchain_core.runnables import RunnableLambda
+
+        stub = LocalStubLLM()
+
+        async def respond(prompt_value):
+            return AIMessage(content=await stub.acomplete(prompt_value.to_string()))
+
+        return STUB_MODEL, RunnableLambda(respond)
+
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return model, ChatGoogleGenerativeAI(model=model, temperature=temperature, google_api_key=api_key)
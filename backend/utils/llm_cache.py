@@ -0,0 +1,133 @@
+#backend/utils/llm_cache.py
+import datetime
+import hashlib
+import json
+import os
+
+# "mongo" keeps completions in the llm_cache collection; "off" always calls the model
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "mongo").lower()
+# 0 keeps entries until they are invalidated
+LLM_CACHE_TTL_S = int(os.getenv("LLM_CACHE_TTL_S", str(7 * 24 * 3600)))
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def template_hash(template: str) -> str:
+    return _sha256(template)
+
+
+def inputs_hash(inputs: dict) -> str:
+    return _sha256(json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str))
+
+
+def llm_cache_key(model: str, temperature: float, template_digest: str, inputs_digest: str) -> str:
+    return _sha256(f"{model}|{temperature}|{template_digest}|{inputs_digest}")
+
+
+class LLMCache:
+    """Persistent cache of LLM completions keyed by (model, temperature, template hash, inputs hash).
+
+    The parsed form of a completion is stored next to the raw text, so a hit needs no
+    re-parsing and costs no tokens.
+    """
+
+    def __init__(self, backend: str = LLM_CACHE_BACKEND, ttl_s: int = LLM_CACHE_TTL_S):
+        self.backend = backend
+        self.ttl_s = ttl_s
+        self._collection = None
+        self.counters = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+    def _persistent(self):
+        if self.backend != "mongo":
+            return None
+        if self._collection is None:
+            from database import llm_cache_collection
+            self._collection = llm_cache_collection
+        return self._collection
+
+    async def get(self, key: str):
+        collection = self._persistent()
+        if collection is None:
+            return None
+        try:
+            doc = await collection.find_one({"_id": key})
+        except Exception as e:
+            self.counters["errors"] += 1
+            print(f"⚠️ LLM cache lookup failed: {e}")
+            return None
+        # The TTL monitor only runs once a minute, so check expiry here too
+        expires_at = doc.get("expires_at") if doc else None
+        if expires_at is not None and expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=datetime.timezone.utc)
+        if doc is None or (expires_at is not None and expires_at <= datetime.datetime.now(datetime.timezone.utc)):
+            self.counters["misses"] += 1
+            return None
+        self.counters["hits"] += 1
+        return doc
+
+    async def put(self, key: str, model: str, temperature: float, template_digest: str,
+                  inputs_digest: str, text: str, parsed):
+        collection = self._persistent()
+        if collection is None:
+            return
+        now = datetime.datetime.now(datetime.timezone.utc)
+        doc = {
+            "model": model,
+            "temperature": temperature,
+            "template_hash": template_digest,
+            "inputs_hash": inputs_digest,
+            "text": text,
+            "parsed": parsed,
+            "created_at": now,
+            "expires_at": now + datetime.timedelta(seconds=self.ttl_s) if self.ttl_s > 0 else None
+        }
+        try:
+            await collection.update_one({"_id": key}, {"$set": doc}, upsert=True)
+            self.counters["writes"] += 1
+        except Exception as e:
+            self.counters["errors"] += 1
+            print(f"⚠️ LLM cache write failed: {e}")
+
+    async def invalidate(self, model: str = None, template_digests: list = None) -> int:
+        """Drop cached completions, optionally only those of one model and/or some prompt templates"""
+        collection = self._persistent()
+        if collection is None:
+            return 0
+        query = {}
+        if model:
+            query["model"] = model
+        if template_digests:
+            query["template_hash"] = {"$in": list(template_digests)}
+        result = await collection.delete_many(query)
+        return result.deleted_count
+
+    def stats(self) -> dict:
+        return {"backend": self.backend, "ttl_s": self.ttl_s, **self.counters}
+
+
+llm_cache = LLMCache()
+
+
+async def cached_completion(runnable, inputs: dict, model: str, temperature: float, template: str, invoke, parse):
+    """(text, parsed, cache_hit) for `runnable` on `inputs`, calling the model only on a miss.
+
+    `invoke(runnable, inputs)` performs the call and returns an object with .content;
+    `parse(text)` produces the structured form stored next to the raw text.
+    """
+    template_digest = template_hash(template)
+    inputs_digest = inputs_hash(inputs)
+    key = llm_cache_key(model, temperature, template_digest, inputs_digest)
+
+    doc = await llm_cache.get(key)
+    if doc is not None:
+        return doc["text"], doc.get("parsed"), True
+
+    response = await invoke(runnable, inputs)
+    text = response.content
+    parsed = parse(text)
+    # Unparseable completions are not cached, so the next run asks again
+    if parsed:
+        await llm_cache.put(key, model, temperature, template_digest, inputs_digest, text, parsed)
+    return text, parsed, False
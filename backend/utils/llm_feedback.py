@@ -0,0 +1,49 @@
+#backend/utils/llm_feedback.py
+import re
+
+
+def parse_llm_feedback(text: str, candidate_ids: list = None):
+    """Parsed feedback for one candidate; with candidate_ids, a dict of candidate_id -> parsed
+    feedback (or None) from a batched response with one <<Candidate: ID>> section each"""
+    if candidate_ids is not None:
+        sections = {}
+        for candidate_id in candidate_ids:
+            match = re.search(
+                rf"<<\s*Candidate:\s*{re.escape(candidate_id)}\s*>>(.*?)(?=<<\s*Candidate:|\Z)", text, re.S
+            )
+            sections[candidate_id] = parse_llm_feedback(match.group(1)) if match else None
+        return sections
+
+    def extract_between(text, start_kw, end_kw):
+        start = text.find(start_kw)
+        if start == -1:
+            return None
+        start += len(start_kw)
+        end = text.find(end_kw, start) if end_kw else len(text)
+        return text[start:end].strip()
+
+    score_text = extract_between(text, "Score:", "Strengths:")
+    strengths_text = extract_between(text, "Strengths:", "Weaknesses:")
+    weaknesses_text = extract_between(text, "Weaknesses:", "Final Recommendation:")
+    recommendation_text = extract_between(text, "Final Recommendation:", None)
+
+    try:
+        match = re.search(r"\b([1-9][0-9])\b", score_text)  # match integers from 10–99
+        score = int(match.group(1)) if match else 0
+        return {
+            "score": score,
+            "strengths": [
+                line.strip("- ").strip()
+                for line in strengths_text.splitlines()
+                if line.strip().startswith("-")
+            ],
+            "weaknesses": [
+                line.strip("- ").strip()
+                for line in weaknesses_text.splitlines()
+                if line.strip().startswith("-")
+            ],
+            "recommendation": recommendation_text.strip()
+        }
+    except Exception as e:
+        print("⚠️ Failed to parse:", e)
+        return None
@@ -0,0 +1,135 @@
+#backend/utils/llm_limiter.py
+import asyncio
+import os
+import random
+import time
+
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+LLM_BURST = int(os.getenv("LLM_BURST", str(LLM_CONCURRENCY)))
+LLM_TIMEOUT_S = float(os.getenv("LLM_TIMEOUT_S", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_BASE_S = float(os.getenv("LLM_BACKOFF_BASE_S", "1"))
+LLM_BACKOFF_MAX_S = float(os.getenv("LLM_BACKOFF_MAX_S", "30"))
+
+# Rate limiting, request timeouts and server-side failures are worth retrying
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+# Matched by class name (anywhere in the MRO) so client libraries need not be imported here
+RETRYABLE_ERROR_NAMES = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+    "DeadlineExceeded", "GatewayTimeout", "BadGateway", "TransportError", "RemoteDisconnected"
+}
+
+
+def _status_code(error: Exception):
+    for value in (getattr(error, "code", None), getattr(error, "status_code", None),
+                  getattr(getattr(error, "response", None), "status_code", None)):
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Timeouts, 429s, 5xx and transport errors; anything else (bad key, invalid request,
+    safety block) fails the same way on every attempt"""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, at most `capacity` saved up"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class LLMLimiter:
+    """Caps concurrent LLM calls and their request rate; retries transient failures with backoff"""
+
+    def __init__(self, concurrency: int, requests_per_minute: float, burst: int,
+                 timeout_s: float, max_retries: int, backoff_base_s: float, backoff_max_s: float):
+        self.concurrency = concurrency
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self.timeout_s = timeout_s
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        # Bound to the event loop on first use
+        self._semaphore = None
+        self._bucket = None
+        self.stats = {"calls": 0, "retries": 0, "timeouts": 0, "failures": 0, "permanent_errors": 0}
+
+    def _primitives(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._bucket = TokenBucket(self.requests_per_minute / 60.0, self.burst)
+        return self._semaphore, self._bucket
+
+    def _backoff(self, attempt: int) -> float:
+        # Exponential backoff with full jitter
+        return random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * (2 ** attempt)))
+
+    async def invoke(self, runnable, inputs: dict):
+        """runnable.ainvoke(inputs) under the concurrency cap, rate limit, timeout and retry policy"""
+        semaphore, bucket = self._primitives()
+        attempt = 0
+        while True:
+            async with semaphore:
+                await bucket.acquire()
+                self.stats["calls"] += 1
+                try:
+                    return await asyncio.wait_for(runnable.ainvoke(inputs), timeout=self.timeout_s)
+                except asyncio.TimeoutError as e:
+                    self.stats["timeouts"] += 1
+                    error = e
+                except Exception as e:
+                    if not is_retryable(e):
+                        self.stats["failures"] += 1
+                        self.stats["permanent_errors"] += 1
+                        raise
+                    error = e
+            if attempt >= self.max_retries:
+                self.stats["failures"] += 1
+                if isinstance(error, asyncio.TimeoutError):
+                    raise TimeoutError(f"LLM call timed out after {self.timeout_s}s") from error
+                raise error
+            attempt += 1
+            self.stats["retries"] += 1
+            print(f"LLM call failed ({error!r}); retry {attempt}/{self.max_retries}")
+            # Back off outside the semaphore so other calls keep the slot busy
+            await asyncio.sleep(self._backoff(attempt))
+
+
+llm_limiter = LLMLimiter(
+    concurrency=LLM_CONCURRENCY,
+    requests_per_minute=LLM_REQUESTS_PER_MINUTE,
+    burst=LLM_BURST,
+    timeout_s=LLM_TIMEOUT_S,
+    max_retries=LLM_MAX_RETRIES,
+    backoff_base_s=LLM_BACKOFF_BASE_S,
+    backoff_max_s=LLM_BACKOFF_MAX_S,
+)
+
+
+async def invoke_llm(runnable, inputs: dict):
+    return await llm_limiter.invoke(runnable, inputs)
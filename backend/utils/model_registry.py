@@ -0,0 +1,144 @@
+#backend/utils/model_registry.py
+import os
+import threading
+import time
+
+SBERT_MODEL_NAME = "all-MiniLM-L6-v2"
+SKILL2VEC_MODEL_NAME = "skill2vec"
+SPACY_MODEL_NAME = "en_core_web_sm"
+
+_loaders = {}
+_fingerprinters = {}
+_fingerprints = {}
+_models = {}
+_stats = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+
+def _rss_bytes():
+    """Resident set size of this process, or None where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def register_model(name: str, loader, fingerprint=None):
+    """Register a zero-argument loader; the model is built on the first get_model(name).
+
+    `fingerprint` (zero-argument) identifies the artifact the loader would load, e.g. the
+    model file's size and mtime; artifacts derived from the model record it.
+    """
+    with _registry_lock:
+        _loaders[name] = loader
+        if fingerprint is not None:
+            _fingerprinters[name] = fingerprint
+        _locks.setdefault(name, threading.Lock())
+        _stats.setdefault(name, {"loaded": False, "load_time_s": None, "rss_delta_mb": None, "hits": 0})
+
+
+def get_model(name: str):
+    """Return the shared instance of a registered model, loading it once on first use"""
+    model = _models.get(name)
+    if model is not None:
+        _stats[name]["hits"] += 1
+        return model
+
+    if name not in _loaders:
+        raise KeyError(f"Model '{name}' is not registered")
+
+    with _locks[name]:
+        # Another thread may have finished loading while we waited for the lock
+        model = _models.get(name)
+        if model is not None:
+            _stats[name]["hits"] += 1
+            return model
+
+        rss_before = _rss_bytes()
+        fingerprint = _current_fingerprint(name)
+        start = time.perf_counter()
+        model = _loaders[name]()
+        load_time = time.perf_counter() - start
+        rss_after = _rss_bytes()
+
+        _stats[name].update({
+            "loaded": True,
+            "load_time_s": round(load_time, 3),
+            "rss_delta_mb": round((rss_after - rss_before) / (1024 * 1024), 1)
+            if rss_before is not None and rss_after is not None else None,
+        })
+        _fingerprints[name] = fingerprint
+        _models[name] = model
+        print(f"Loaded model '{name}' in {load_time:.2f}s")
+        return model
+
+
+def registered_name(model):
+    """Name under which a model instance is registered, or None for unmanaged models"""
+    # Snapshot: another thread may register a freshly loaded model while we iterate
+    for name, instance in list(_models.items()):
+        if instance is model:
+            return name
+    return None
+
+
+def _current_fingerprint(name: str) -> str:
+    fingerprinter = _fingerprinters.get(name)
+    return f"{name}:{fingerprinter()}" if fingerprinter is not None else name
+
+
+def model_fingerprint(name: str) -> str:
+    """Identity of a registered model: that of the loaded instance once loaded, else of the
+    artifact on disk. Changes when the model is rebuilt or swapped."""
+    return _fingerprints.get(name) or _current_fingerprint(name)
+
+
+def model_stats() -> dict:
+    """Per-model load state, load time and resident memory added by the load"""
+    return {name: dict(stats) for name, stats in _stats.items()}
+
+
+def _load_sbert():
+    # Suppress oneDNN logs and general TF warnings before torch/TF get imported
+    os.environ.setdefault("TF_ENABLE_ONEDNN_OPTS", "0")
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(SBERT_MODEL_NAME)
+
+
+def _load_skill2vec():
+    from routes.train_model import load_skill2vec_model
+    return load_skill2vec_model()
+
+
+def _skill2vec_fingerprint():
+    from routes.train_model import MODEL_PATH
+    try:
+        stat = os.stat(MODEL_PATH)
+    except OSError:
+        return "missing"
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _load_spacy():
+    import spacy
+    return spacy.load(SPACY_MODEL_NAME)
+
+
+register_model(SBERT_MODEL_NAME, _load_sbert)
+register_model(SKILL2VEC_MODEL_NAME, _load_skill2vec, _skill2vec_fingerprint)
+register_model(SPACY_MODEL_NAME, _load_spacy)
+
+
+def get_sbert():
+    return get_model(SBERT_MODEL_NAME)
+
+
+def get_skill2vec():
+    return get_model(SKILL2VEC_MODEL_NAME)
+
+
+def get_spacy():
+    return get_model(SPACY_MODEL_NAME)
@@ -0,0 +1,20 @@
+#backend/utils/pdf_source.py
+import fitz
+
+
+def open_pdf(source) -> fitz.Document:
+    """Open a PDF from a path, raw bytes or a binary file-like object.
+
+    Bytes and buffers are opened straight from memory, so parsing a download never
+    touches the disk.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=bytes(source), filetype="pdf")
+    if hasattr(source, "read"):
+        return fitz.open(stream=source.read(), filetype="pdf")
+    return fitz.open(source)
+
+
+def pdf_text(source) -> str:
+    with open_pdf(source) as doc:
+        return "\n".join([page.get_text() for page in doc])
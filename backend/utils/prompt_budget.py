@@ -0,0 +1,82 @@
+#backend/utils/prompt_budget.py
+import os
+import re
+
+# Per-section token budgets for the feedback prompt (local estimate, see estimate_tokens)
+PROMPT_JD_TOKENS = int(os.getenv("PROMPT_JD_TOKENS", "400"))
+PROMPT_CV_TEXT_TOKENS = int(os.getenv("PROMPT_CV_TEXT_TOKENS", "500"))
+PROMPT_CV_CHUNKS_TOKENS = int(os.getenv("PROMPT_CV_CHUNKS_TOKENS", "400"))
+# Chunks sharing at least this fraction of their words with a kept chunk are dropped
+PROMPT_NEAR_DUPLICATE = float(os.getenv("PROMPT_NEAR_DUPLICATE", "0.8"))
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_WORD_RE = re.compile(r"\w+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count without a model tokenizer: words and punctuation marks"""
+    return len(_TOKEN_RE.findall(text or ""))
+
+
+def _words(text: str) -> set:
+    return set(_WORD_RE.findall(text.lower()))
+
+
+def dedupe_chunks(chunks: list, seen: list = None, threshold: float = PROMPT_NEAR_DUPLICATE) -> list:
+    """Drop empty chunks and chunks that (nearly) repeat an earlier one or one in `seen`.
+
+    A chunk is a near duplicate when `threshold` of its words already occur in a single
+    kept chunk, which also catches a chunk contained in a longer one.
+    """
+    kept, kept_words = [], [_words(chunk) for chunk in (seen or [])]
+    for chunk in chunks:
+        chunk = " ".join((chunk or "").split())
+        words = _words(chunk)
+        if not words:
+            continue
+        if any(len(words & other) >= threshold * len(words) for other in kept_words):
+            continue
+        kept.append(chunk)
+        kept_words.append(words)
+    return kept
+
+
+def fit_to_budget(chunks: list, max_tokens: int) -> list:
+    """Leading chunks that fit in `max_tokens`; the chunk crossing the budget is cut short"""
+    fitted, used = [], 0
+    for chunk in chunks:
+        tokens = estimate_tokens(chunk)
+        if used + tokens <= max_tokens:
+            fitted.append(chunk)
+            used += tokens
+            continue
+        remaining = max_tokens - used
+        if remaining > 0:
+            # Cut the original text after the last token that fits, keeping its spacing intact
+            for count, match in enumerate(_TOKEN_RE.finditer(chunk), 1):
+                if count == remaining:
+                    fitted.append(chunk[:match.end()] + " ...")
+                    break
+        break
+    return fitted
+
+
+def compact_sections(sections: dict, budgets: dict) -> dict:
+    """section -> budgeted text. Sections are deduped in order, each against the ones before it.
+
+    sections: name -> list of chunks, most important section first.
+    """
+    compacted, seen = {}, []
+    for name, chunks in sections.items():
+        compacted[name] = fit_to_budget(dedupe_chunks(chunks, seen), budgets[name])
+        # Only what made it into the prompt counts as seen; a chunk cut by this section's
+        # budget may still appear in a later section
+        seen.extend(compacted[name])
+    return compacted
+
+
+def prompt_size(inputs: dict, template: str = "") -> dict:
+    """Estimated tokens per prompt input, and in total including the template, for logging"""
+    sizes = {name: estimate_tokens(value) for name, value in inputs.items()}
+    sizes["total"] = sum(sizes.values()) + estimate_tokens(template)
+    return sizes
@@ -0,0 +1,374 @@
+#backend/utils/vector_store.py
+import contextlib
+import json
+import os
+import threading
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_VECTOR_STORE_PATH = os.path.join(BACKEND_DIR, "artifacts", "vector_store")
+DEFAULT_PINECONE_INDEX_NAME = "cv-index"
+VECTOR_DIMENSION = 384  # all-MiniLM-L6-v2
+# The local store rewrites its files once superseded rows outnumber live ones (and exceed this)
+COMPACT_MIN_DEAD_ROWS = 1000
+# Metadata field the local store keeps a row index for (chunk searches are scoped to one resume)
+INDEXED_FIELD = "resume_id"
+
+
+def matches_filter(metadata: dict, filter: dict) -> bool:
+    """Pinecone-style metadata filter: {"field": value} or {"field": {"$eq"|"$ne"|"$in"|"$nin": ...}}"""
+    for field, condition in (filter or {}).items():
+        value = metadata.get(field)
+        if isinstance(condition, dict):
+            for op, operand in condition.items():
+                if op == "$eq" and value != operand:
+                    return False
+                if op == "$ne" and value == operand:
+                    return False
+                if op == "$in" and value not in operand:
+                    return False
+                if op == "$nin" and value in operand:
+                    return False
+        elif value != condition:
+            return False
+    return True
+
+
+class VectorStore:
+    """Minimal vector index interface shared by the local and Pinecone backends"""
+
+    def upsert(self, items: list):
+        """items: (id, vector, metadata) tuples"""
+        raise NotImplementedError
+
+    def delete(self, ids: list = None, filter: dict = None):
+        raise NotImplementedError
+
+    def query(self, vector, top_k: int = 5, filter: dict = None) -> list:
+        """Best matches as {"id", "score", "metadata"} dicts, highest cosine similarity first"""
+        raise NotImplementedError
+
+    def list_ids(self, prefix: str) -> list:
+        """Ids of stored vectors starting with `prefix`"""
+        raise NotImplementedError
+
+
+class LocalVectorStore(VectorStore):
+    """Flat cosine index held in a NumPy matrix and persisted under `path`.
+
+    Writes are appended: vectors to vectors.f32 (raw float32 rows) and one upsert or delete
+    per line to log.jsonl, so indexing a resume costs I/O for that resume only. The files are
+    compacted once most rows are superseded. Live rows are indexed by resume_id, so a
+    search filtered to one resume scores only that resume's rows. Processes sharing `path` (the API and an
+    external evaluation worker) serialize writes through an flock on `path`/lock and replay
+    each other's appends before every read and write. Without fcntl (Windows) the store is
+    single-process only.
+    """
+
+    def __init__(self, path: str = DEFAULT_VECTOR_STORE_PATH, dimension: int = VECTOR_DIMENSION):
+        self.path = path
+        self.dimension = dimension
+        self._row_bytes = 4 * dimension
+        self._lock = threading.Lock()
+        self._reset()
+        os.makedirs(path, exist_ok=True)
+        self._lock_file = open(os.path.join(path, "lock"), "a+")
+        with self._lock, self._file_lock(exclusive=True):
+            self._sync()
+
+    def _files(self):
+        return os.path.join(self.path, "vectors.f32"), os.path.join(self.path, "log.jsonl")
+
+    def _reset(self):
+        # Rows mirror vectors.f32; rows of deleted or replaced ids have id None
+        self._vectors = np.zeros((0, self.dimension), dtype=np.float32)  # grown geometrically
+        self._rows = 0
+        self._ids = []
+        self._metadata = []
+        self._positions = {}
+        self._by_resume = {}  # resume_id -> live rows
+        self._log_inode = None
+        self._log_offset = 0
+
+    @contextlib.contextmanager
+    def _file_lock(self, exclusive: bool):
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _ensure_capacity(self, rows: int):
+        if rows > len(self._vectors):
+            grown = np.zeros((max(rows, 2 * len(self._vectors), 1024), self.dimension), dtype=np.float32)
+            grown[:self._rows] = self._vectors[:self._rows]
+            self._vectors = grown
+
+    def _read_vectors(self, vectors_file: str):
+        file_rows = os.path.getsize(vectors_file) // self._row_bytes if os.path.exists(vectors_file) else 0
+        if file_rows <= self._rows:
+            return
+        with open(vectors_file, "rb") as f:
+            f.seek(self._rows * self._row_bytes)
+            tail = np.frombuffer(f.read((file_rows - self._rows) * self._row_bytes), dtype=np.float32)
+        self._ensure_capacity(file_rows)
+        self._vectors[self._rows:file_rows] = tail.reshape(-1, self.dimension)
+        self._ids.extend([None] * (file_rows - self._rows))
+        self._metadata.extend([None] * (file_rows - self._rows))
+        self._rows = file_rows
+
+    def _sync(self):
+        """Replay whatever was appended to the files since the last sync (by any process)"""
+        vectors_file, log_file = self._files()
+        try:
+            log_stat = os.stat(log_file)
+        except FileNotFoundError:
+            if self._log_inode is not None:
+                self._reset()
+            return
+        if log_stat.st_ino != self._log_inode:
+            # First load, or another process compacted the files
+            self._reset()
+            self._log_inode = log_stat.st_ino
+        if log_stat.st_size == self._log_offset:
+            return
+        self._read_vectors(vectors_file)
+        with open(log_file, "rb") as f:
+            f.seek(self._log_offset)
+            data = f.read()
+        complete = data.rfind(b"\n") + 1  # a partly written last line is picked up next time
+        for line in data[:complete].splitlines():
+            if line.strip():
+                self._apply(json.loads(line))
+        self._log_offset += complete
+
+    def _drop(self, id_):
+        row = self._positions.pop(id_, None)
+        if row is not None:
+            resume_id = self._metadata[row].get(INDEXED_FIELD)
+            rows = self._by_resume.get(resume_id)
+            if rows is not None:
+                rows.discard(row)
+                if not rows:
+                    del self._by_resume[resume_id]
+            self._ids[row] = None
+            self._metadata[row] = None
+
+    def _apply(self, record: dict):
+        if "delete" in record:
+            self._drop(record["delete"])
+            return
+        self._drop(record["id"])
+        row = record["row"]
+        self._positions[record["id"]] = row
+        self._ids[row] = record["id"]
+        self._metadata[row] = record["metadata"]
+        if record["metadata"].get(INDEXED_FIELD) is not None:
+            self._by_resume.setdefault(record["metadata"][INDEXED_FIELD], set()).add(row)
+
+    def _file_rows(self) -> int:
+        """Rows in vectors.f32 (which may include rows a crashed writer never logged)"""
+        vectors_file = self._files()[0]
+        size = os.path.getsize(vectors_file) if os.path.exists(vectors_file) else 0
+        if size % self._row_bytes:
+            # Drop a partial row left by a crashed writer so row numbers stay aligned
+            os.truncate(vectors_file, size - size % self._row_bytes)
+        return size // self._row_bytes
+
+    def _append(self, vectors, records: list):
+        """Append rows and log records; called with both locks held"""
+        vectors_file, log_file = self._files()
+        if vectors is not None:
+            with open(vectors_file, "ab") as f:
+                f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        with open(log_file, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(record) + "\n" for record in records))
+        self._sync()
+        self._maybe_compact()
+
+    def _write_files(self, vectors, ids: list, metadata: list):
+        """Replace both files with exactly these rows"""
+        vectors_file, log_file = self._files()
+        with open(vectors_file + ".tmp", "wb") as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        with open(log_file + ".tmp", "w", encoding="utf-8") as f:
+            f.write("".join(
+                json.dumps({"id": id_, "row": row, "metadata": meta}) + "\n"
+                for row, (id_, meta) in enumerate(zip(ids, metadata))
+            ))
+        os.replace(vectors_file + ".tmp", vectors_file)
+        os.replace(log_file + ".tmp", log_file)
+
+    def _maybe_compact(self):
+        dead = self._rows - len(self._positions)
+        if dead < COMPACT_MIN_DEAD_ROWS or dead < len(self._positions):
+            return
+        live = sorted(self._positions.values())
+        self._write_files(self._vectors[live], [self._ids[r] for r in live], [self._metadata[r] for r in live])
+        self._reset()
+        self._sync()
+
+    def _refresh(self):
+        with self._file_lock(exclusive=False):
+            self._sync()
+
+    def _candidate_rows(self, filter: dict):
+        """Rows that can match `filter`: the indexed resume's rows when it pins resume_id"""
+        condition = filter.get(INDEXED_FIELD)
+        if condition is None:
+            return self._positions.values()
+        if isinstance(condition, dict):
+            if "$eq" in condition:
+                return self._by_resume.get(condition["$eq"], ())
+            if "$in" in condition:
+                return set().union(*(self._by_resume.get(value, ()) for value in condition["$in"]))
+            return self._positions.values()
+        return self._by_resume.get(condition, ())
+
+    def _live_rows(self, filter: dict = None) -> list:
+        if filter is None:
+            return list(self._positions.values())
+        return sorted(row for row in self._candidate_rows(filter) if matches_filter(self._metadata[row], filter))
+
+    @staticmethod
+    def _unit(vectors) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+    def upsert(self, items: list):
+        if not items:
+            return
+        with self._lock, self._file_lock(exclusive=True):
+            self._sync()
+            start = self._file_rows()
+            vectors = self._unit([vector for _, vector, _ in items]).reshape(len(items), self.dimension)
+            self._append(vectors, [
+                {"id": id_, "row": start + i, "metadata": dict(metadata or {})}
+                for i, (id_, _, metadata) in enumerate(items)
+            ])
+
+    def delete(self, ids: list = None, filter: dict = None):
+        with self._lock, self._file_lock(exclusive=True):
+            self._sync()
+            drop = {id_ for id_ in (ids or []) if id_ in self._positions}
+            if filter is not None:
+                drop.update(self._ids[row] for row in self._live_rows(filter))
+            if drop:
+                self._append(None, [{"delete": id_} for id_ in sorted(drop)])
+
+    def query(self, vector, top_k: int = 5, filter: dict = None) -> list:
+        with self._lock:
+            self._refresh()
+            rows = np.array(self._live_rows(filter), dtype=int)
+            if rows.size == 0:
+                return []
+            scores = self._vectors[rows] @ self._unit(vector)
+            k = min(top_k, rows.size)
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+            return [
+                {"id": self._ids[rows[i]], "score": float(scores[i]), "metadata": dict(self._metadata[rows[i]])}
+                for i in best
+            ]
+
+    def list_ids(self, prefix: str) -> list:
+        with self._lock:
+            self._refresh()
+            return [id_ for id_ in self._positions if id_.startswith(prefix)]
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._positions)
+
+
+class PineconeVectorStore(VectorStore):
+    """Pinecone serverless index; created on first use rather than at import"""
+
+    def __init__(self, api_key: str, index_name: str = DEFAULT_PINECONE_INDEX_NAME, dimension: int = VECTOR_DIMENSION):
+        self.api_key = api_key
+        self.index_name = index_name
+        self.dimension = dimension
+        self._index = None
+        self._lock = threading.Lock()
+
+    def _get_index(self):
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    from pinecone import Pinecone, ServerlessSpec
+                    pc = Pinecone(api_key=self.api_key)
+                    if self.index_name not in pc.list_indexes().names():
+                        pc.create_index(
+                            name=self.index_name,
+                            dimension=self.dimension,
+                            metric="cosine",
+                            spec=ServerlessSpec(
+                                cloud="gcp",           # or "aws"
+                                region="us-central1"   # match Pinecone dashboard region
+                            )
+                        )
+                    self._index = pc.Index(self.index_name)
+        return self._index
+
+    def upsert(self, items: list):
+        if items:
+            self._get_index().upsert([(id_, list(map(float, vector)), metadata) for id_, vector, metadata in items])
+
+    def delete(self, ids: list = None, filter: dict = None):
+        if ids:
+            self._get_index().delete(ids=list(ids))
+        if filter is not None:
+            self._get_index().delete(filter=filter)
+
+    def query(self, vector, top_k: int = 5, filter: dict = None) -> list:
+        result = self._get_index().query(
+            vector=list(map(float, vector)), top_k=top_k, include_metadata=True, filter=filter
+        )
+        return [
+            {"id": match["id"], "score": match["score"], "metadata": match.get("metadata") or {}}
+            for match in result["matches"]
+        ]
+
+    def list_ids(self, prefix: str) -> list:
+        # Serverless indexes page through ids by prefix
+        ids = []
+        for page in self._get_index().list(prefix=prefix):
+            ids.extend(page)
+        return ids
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_vector_store() -> VectorStore:
+    """The configured vector store, created on first use (after .env is loaded).
+
+    VECTOR_STORE_BACKEND is "local" (NumPy index under VECTOR_STORE_PATH) or "pinecone"
+    (PINECONE_INDEX_NAME); unset, it is pinecone only when a Pinecone key is configured.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                api_key = os.getenv("LLM")
+                backend = os.getenv("VECTOR_STORE_BACKEND", "").lower() or ("pinecone" if api_key else "local")
+                if backend == "pinecone":
+                    _store = PineconeVectorStore(
+                        api_key=api_key, index_name=os.getenv("PINECONE_INDEX_NAME", DEFAULT_PINECONE_INDEX_NAME)
+                    )
+                else:
+                    _store = LocalVectorStore(os.getenv("VECTOR_STORE_PATH", DEFAULT_VECTOR_STORE_PATH))
+    return _store